@@ -4,7 +4,8 @@
 :synopsis: Initialize the SQLite database schema for the School Management System.
 
 This module creates the core tables used by the School Management System and
-enables SQLite foreign key constraints.
+enables SQLite foreign key constraints. The DDL lives in ``create_schema`` so the
+repository (``db.sqlite_repo``) can run the exact same schema on its own connection.
 
 Tables Created
 --------------
@@ -16,15 +17,157 @@ Tables Created
 Notes
 -----
 - Uses `PRAGMA foreign_keys = ON;` because SQLite doesn't enforce FKs by default.
-- The schema is intentionally minimal (fits the lab). No fancy indices beyond PKs.
+- Switches the file to WAL journaling (`PRAGMA journal_mode = WAL;`). Unlike most
+  PRAGMAs this one is stored in the database file, so doing it once here is enough.
+- All tables are ``WITHOUT ROWID`` (rows stored in the PK B-tree). Files made
+  before that are rebuilt once by ``create_schema``.
+- The schema is intentionally minimal (fits the lab). Besides the PKs there are
+  only two indexes, on the FK columns the PKs don't cover (REGISTRATION.c_id, as
+  a covering (c_id, s_id) index, and COURSES.i_id), so per-course lookups and FK
+  cascades don't scan whole tables.
 """
 
 import sqlite3
+import warnings
 from pathlib import Path
 
 # Database file path -> db/school.db
 DB_PATH = Path(__file__).resolve().parent / "school.db"
 
+# Table bodies, keyed by name (dict order = creation order, parents first).
+# All four are WITHOUT ROWID: the data lives in the PK B-tree itself, so a
+# point lookup by id is one tree walk instead of PK index + rowid table.
+# Keys are short TEXT ids, which is exactly the case WITHOUT ROWID is good at.
+_TABLES = {
+    "STUDENTS": """(
+        student_id TEXT PRIMARY KEY,
+        name TEXT NOT NULL,
+        age INTEGER NOT NULL,
+        email TEXT NOT NULL
+    ) WITHOUT ROWID""",
+    "INSTRUCTORS": """(
+        instructor_id TEXT PRIMARY KEY,
+        name TEXT NOT NULL,
+        age INTEGER NOT NULL,
+        email TEXT NOT NULL
+    ) WITHOUT ROWID""",
+    "COURSES": """(
+        course_id TEXT PRIMARY KEY,
+        course_name TEXT NOT NULL,
+        i_id TEXT DEFAULT NULL,
+        FOREIGN KEY (i_id) REFERENCES INSTRUCTORS(instructor_id) ON DELETE SET NULL ON UPDATE CASCADE
+    ) WITHOUT ROWID""",
+    "REGISTRATION": """(
+        s_id TEXT NOT NULL,
+        c_id TEXT NOT NULL,
+        PRIMARY KEY (s_id, c_id),
+        FOREIGN KEY (s_id) REFERENCES STUDENTS(student_id) ON DELETE CASCADE ON UPDATE CASCADE,
+        FOREIGN KEY (c_id) REFERENCES COURSES(course_id) ON DELETE CASCADE ON UPDATE CASCADE
+    ) WITHOUT ROWID""",
+}
+
+_SCHEMA_SQL = "".join(
+    f"\n    CREATE TABLE IF NOT EXISTS {name} {body};\n" for name, body in _TABLES.items()
+) + """
+    -- (s_id, c_id) PK already serves s_id lookups; these cover the other FK columns.
+    -- (c_id, s_id) holds both REGISTRATION columns, so "students of course X" is
+    -- answered from the index alone (replaces the older c_id-only index)
+    DROP INDEX IF EXISTS idx_registration_c_id;
+    CREATE INDEX IF NOT EXISTS idx_registration_c_s ON REGISTRATION(c_id, s_id);
+    CREATE INDEX IF NOT EXISTS idx_courses_i_id ON COURSES(i_id);
+"""
+
+
+def _migrate_rowid_tables(conn: sqlite3.Connection) -> None:
+    """Rebuild tables created by older versions (plain rowid tables) as WITHOUT ROWID.
+
+    Parameters
+    ----------
+    conn : sqlite3.Connection
+        Open connection, not inside a transaction.
+
+    Returns
+    -------
+    None
+
+    Notes
+    -----
+    - ``CREATE TABLE IF NOT EXISTS`` never touches an existing table, so files
+      made before the switch (e.g. the shipped ``school.db``) need this one-time
+      copy: create ``<T>__new``, copy rows, drop ``<T>``, rename back. That's the
+      usual SQLite "12-step" table rebuild.
+    - FKs are switched off meanwhile (dropping a parent would otherwise cascade
+      into REGISTRATION) and restored afterwards. The indexes go away with the
+      old tables; ``create_schema`` recreates them right after.
+    - If existing rows break the new constraints (``IntegrityError``), the copy
+      is rolled back and a ``RuntimeWarning`` is issued; the old tables stay and
+      keep working, they are just not WITHOUT ROWID.
+    - No-op (one small sqlite_master query) once everything is migrated.
+    """
+    stale = [
+        name for name, sql in conn.execute(
+            "SELECT name, sql FROM sqlite_master WHERE type = 'table'"
+        )
+        if name in _TABLES and "WITHOUT ROWID" not in sql.upper()
+    ]
+    if not stale:
+        return
+
+    fk_on = conn.execute("PRAGMA foreign_keys").fetchone()[0]
+    conn.execute("PRAGMA foreign_keys = OFF")
+    try:
+        conn.execute("BEGIN")
+        try:
+            for name in stale:
+                conn.execute(f"CREATE TABLE {name}__new {_TABLES[name]}")
+                conn.execute(f"INSERT INTO {name}__new SELECT * FROM {name}")
+                conn.execute(f"DROP TABLE {name}")
+                conn.execute(f"ALTER TABLE {name}__new RENAME TO {name}")
+            conn.execute("COMMIT")
+        except sqlite3.IntegrityError as e:
+            # old rowid tables accepted rows WITHOUT ROWID rejects (e.g. a NULL
+            # TEXT primary key); keep the file usable as-is instead of failing
+            conn.execute("ROLLBACK")
+            warnings.warn(
+                f"Could not rebuild {', '.join(stale)} as WITHOUT ROWID ({e}); "
+                "keeping the existing tables",
+                RuntimeWarning,
+            )
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+    finally:
+        conn.execute(f"PRAGMA foreign_keys = {'ON' if fk_on else 'OFF'}")
+
+
+def create_schema(conn: sqlite3.Connection) -> None:
+    """Create all tables/indexes (if missing) and switch the file to WAL.
+
+    Parameters
+    ----------
+    conn : sqlite3.Connection
+        Open connection to the target database.
+
+    Returns
+    -------
+    None
+
+    Notes
+    -----
+    - Single source of truth for the schema: both ``init_db`` and
+      ``SQLiteRepository`` call this, so they can't drift apart.
+    - ``executescript`` commits any pending transaction first (sqlite3 behavior),
+      so call it before doing other work on the connection.
+    """
+    # persistent: every later connection to this file also uses WAL
+    conn.execute("PRAGMA journal_mode = WAL;")
+
+    # older files still have rowid tables; rebuild those first (no-op otherwise)
+    _migrate_rowid_tables(conn)
+
+    # Creating all the tables in one go; easier to read than executing many small strings
+    conn.executescript(_SCHEMA_SQL)
+
 
 def init_db(db_path: Path = DB_PATH):
     """Initialize the SQLite database and create all tables if missing.
@@ -48,6 +191,8 @@ def init_db(db_path: Path = DB_PATH):
     -----
     - This function is idempotent: it uses `CREATE TABLE IF NOT EXISTS`.
     - Foreign key constraints are enabled for the connection (important!).
+    - WAL mode means commits append to ``school.db-wal`` instead of rewriting a
+      rollback journal, so each commit costs far fewer fsyncs.
     """
     # make sure the parent folder exists (otherwise sqlite will fail when opening file)
     db_path.parent.mkdir(parents=True, exist_ok=True)
@@ -58,38 +203,8 @@ def init_db(db_path: Path = DB_PATH):
 
     # enforce FK constraints (SQLite needs this per-connection)
     cur.execute("PRAGMA foreign_keys = ON;")
-
-    # Creating all the tables in one go; easier to read than executing many small strings
-    cur.executescript("""
-    CREATE TABLE IF NOT EXISTS STUDENTS (
-        student_id TEXT PRIMARY KEY,
-        name TEXT NOT NULL,
-        age INTEGER NOT NULL,
-        email TEXT NOT NULL
-    );
-
-    CREATE TABLE IF NOT EXISTS INSTRUCTORS (
-        instructor_id TEXT PRIMARY KEY,
-        name TEXT NOT NULL,
-        age INTEGER NOT NULL,
-        email TEXT NOT NULL
-    );
-
-    CREATE TABLE IF NOT EXISTS COURSES (
-        course_id TEXT PRIMARY KEY,
-        course_name TEXT NOT NULL,
-        i_id TEXT DEFAULT NULL,
-        FOREIGN KEY (i_id) REFERENCES INSTRUCTORS(instructor_id) ON DELETE SET NULL ON UPDATE CASCADE
-    );
-
-    CREATE TABLE IF NOT EXISTS REGISTRATION (
-        s_id TEXT NOT NULL,
-        c_id TEXT NOT NULL,
-        PRIMARY KEY (s_id, c_id),
-        FOREIGN KEY (s_id) REFERENCES STUDENTS(student_id) ON DELETE CASCADE ON UPDATE CASCADE,
-        FOREIGN KEY (c_id) REFERENCES COURSES(course_id) ON DELETE CASCADE ON UPDATE CASCADE
-    );
-    """)
+    # tables + indexes (shared with the repository)
+    create_schema(conn)
 
     # commit + close like good citizens
     conn.commit()
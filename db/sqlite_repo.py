@@ -11,16 +11,179 @@ Notes
 -----
 - Designed to be small and straightforward for the lab. Not production-optimized.
 - Foreign keys are enabled via PRAGMA to keep relational integrity (basic).
+- The schema comes from ``db.init_db.create_schema``; the repository runs it on
+  connect, so pointing it at a brand-new file just works.
 """
 
+import json
 import sqlite3
+from contextlib import contextmanager
+from functools import lru_cache
+from itertools import combinations
 from pathlib import Path
-from typing import Any, List, Dict, Optional, Tuple
+from typing import Any, Callable, IO, List, Dict, Iterable, Iterator, Optional, Tuple, TYPE_CHECKING
 import os
+import weakref
+
+from db.init_db import create_schema
+
+try:  # optional speedup for JSON export/import; stdlib json is the fallback
+    import orjson
+except ImportError:
+    orjson = None
+
+if TYPE_CHECKING:
+    from src.models import Student, Instructor, Course
 
 
 DB_PATH = Path(__file__).resolve().parent / "school.db"
 
+# per-connection settings (these reset on every connect, unlike journal_mode=WAL
+# which init_db/create_schema stores in the file itself)
+# (override per repository with SQLiteRepository(..., pragmas={...}))
+_CONNECTION_PRAGMAS: Dict[str, Any] = {
+    "foreign_keys": "ON",      # yeah this is important for FK checks
+    "synchronous": "NORMAL",   # safe with WAL: one fewer fsync per commit
+    "temp_store": "MEMORY",    # sorts/temp b-trees (ORDER BY, GROUP BY) stay in RAM
+    "cache_size": -65536,      # page cache up to 64 MiB (negative = KiB)
+    "mmap_size": 268435456,    # read up to 256 MiB through mmap, no read() copies
+}
+
+# column lists per table (same order as the schema in init_db); used instead of
+# SELECT * so a future extra column doesn't silently change what we return
+_TABLE_COLUMNS = {
+    "STUDENTS": ("student_id", "name", "age", "email"),
+    "INSTRUCTORS": ("instructor_id", "name", "age", "email"),
+    "COURSES": ("course_id", "course_name", "i_id"),
+    "REGISTRATION": ("s_id", "c_id"),
+}
+_SCHEMA_PROBE_SQL = (
+    "SELECT count(*) FROM sqlite_master WHERE type = 'table' AND name IN ("
+    + ", ".join("?" * len(_TABLE_COLUMNS)) + ")"
+)
+_SELECT = {t: f"SELECT {', '.join(cols)} FROM {t}" for t, cols in _TABLE_COLUMNS.items()}
+
+
+def _update_statements(table: str, pk: str, cols: Tuple[str, ...]) -> Dict[Tuple[str, ...], str]:
+    """Precompute one UPDATE per non-empty subset of ``cols`` (keyed by that subset).
+
+    The ``update_*`` methods look their SQL up here instead of building it with
+    f-strings on every call, so each shape is one constant string (statement cache hit).
+    """
+    return {
+        combo: f"UPDATE {table} SET {', '.join(c + '=?' for c in combo)} WHERE {pk}=?"
+        for n in range(1, len(cols) + 1)
+        for combo in combinations(cols, n)
+    }
+
+
+# get_registrations / iter_registrations, keyed by (filter on s_id?, filter on c_id?)
+_REGISTRATION_SQL = {
+    (False, False): _SELECT["REGISTRATION"],
+    (True, False): _SELECT["REGISTRATION"] + " WHERE s_id=?",
+    (False, True): _SELECT["REGISTRATION"] + " WHERE c_id=?",
+    (True, True): _SELECT["REGISTRATION"] + " WHERE s_id=? AND c_id=?",
+}
+
+_UPDATE_SQL = {
+    "STUDENTS": _update_statements("STUDENTS", "student_id", ("name", "age", "email")),
+    "INSTRUCTORS": _update_statements("INSTRUCTORS", "instructor_id", ("name", "age", "email")),
+    "COURSES": _update_statements("COURSES", "course_id", ("course_name", "i_id")),
+}
+
+@lru_cache(maxsize=64)
+def _search_sql(table: str, keys: Tuple[str, ...]) -> str:
+    """SQL for ``search(table, **filters)``; ``keys`` must be sorted, whitelisted columns."""
+    return _SELECT[table] + "".join(
+        (" WHERE " if n == 0 else " AND ") + f"{k} LIKE ?" for n, k in enumerate(keys)
+    )
+
+
+# one SELECT arm per searchable kind; search_all glues the requested ones together
+# with UNION ALL so SQLite plans a single statement and :q is bound once
+_SEARCH_ARMS = {
+    "Student": "SELECT 'Student' AS type, name, student_id AS id_number, email, age FROM STUDENTS"
+               " WHERE name LIKE :q OR student_id LIKE :q",
+    "Instructor": "SELECT 'Instructor' AS type, name, instructor_id AS id_number, email, age FROM INSTRUCTORS"
+                  " WHERE name LIKE :q OR instructor_id LIKE :q",
+    "Course": "SELECT 'Course' AS type, course_name AS name, course_id AS id_number, '' AS email, '' AS age"
+              " FROM COURSES WHERE course_name LIKE :q OR course_id LIKE :q",
+}
+SEARCH_KINDS: Tuple[str, ...] = tuple(_SEARCH_ARMS)
+
+
+@lru_cache(maxsize=None)
+def _search_all_sql(kinds: Tuple[str, ...]) -> str:
+    """Build (once per combination of kinds) the UNION ALL search statement.
+
+    The arms are wrapped so the ORDER BY can rank by ``type``; a bare UNION ALL
+    has no guaranteed output order.
+    """
+    union = "\nUNION ALL\n".join(_SEARCH_ARMS[k] for k in SEARCH_KINDS if k in kinds)
+    rank = " ".join(f"WHEN '{k}' THEN {n}" for n, k in enumerate(SEARCH_KINDS))
+    return (f"SELECT type, name, id_number, email, age FROM (\n{union}\n)"
+            f" ORDER BY CASE type {rank} END")
+
+
+def _dump_tables(fp: IO[str], tables: Iterable[Tuple[str, Callable[[], Iterable[Dict[str, Any]]]]],
+                 pretty: bool) -> None:
+    """Write ``{"<table>": [rows...], ...}`` to ``fp`` one row at a time.
+
+    Parameters
+    ----------
+    fp : text file
+        Open file to write to.
+    tables : Iterable[tuple[str, callable]]
+        ``(key, rows_fn)`` pairs; ``rows_fn()`` is only called when that table is reached.
+    pretty : bool
+        Match ``json.dump(..., indent=2)`` when True, else compact separators.
+
+    Returns
+    -------
+    None
+
+    Notes
+    -----
+    - Byte-for-byte the same as dumping the whole dict, so old exports still diff cleanly.
+    - Rows are encoded with ``orjson`` when it's installed, stdlib ``json`` otherwise.
+    - Encoded strings never contain a raw newline (JSON escapes them), so re-indenting
+      a row with ``str.replace`` is safe.
+    """
+    if pretty:
+        nl, row_nl, key_sep, end = "\n  ", "\n    ", ": ", "\n}"
+    else:
+        nl, row_nl, key_sep, end = "", "", ":", "}"
+    if orjson is not None:
+        # orjson's INDENT_2 / compact output matches the stdlib settings below
+        opt = orjson.OPT_INDENT_2 if pretty else 0
+        def encode(obj: Any) -> str:
+            return orjson.dumps(obj, option=opt).decode("utf-8")
+    elif pretty:
+        encode = json.JSONEncoder(ensure_ascii=False, indent=2).encode
+    else:
+        encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+    fp.write("{" + nl)
+    for n, (key, rows_fn) in enumerate(tables):
+        if n:
+            fp.write("," + nl)
+        fp.write(encode(key) + key_sep)
+        first = True
+        for row in rows_fn():
+            fp.write(("[" if first else ",") + row_nl + encode(row).replace("\n", row_nl))
+            first = False
+        fp.write("[]" if first else nl + "]")
+    fp.write(end)
+
+
+def _close_connection(conn: sqlite3.Connection) -> None:
+    """Refresh planner stats if SQLite thinks it's worth it (cheap), then close politely."""
+    try:
+        conn.execute("PRAGMA optimize;")
+    except sqlite3.Error:
+        pass  # best effort only (locked db, already closed, ...); closing matters more
+    finally:
+        conn.close()
+
 
 class SQLiteRepository:
     """
@@ -35,20 +198,114 @@ class SQLiteRepository:
     ----------
     conn : sqlite3.Connection
         Active SQLite database connection. Exposed here for simplicity (lab style).
+        Its ``row_factory`` is ``sqlite3.Row``.
     """
 
-    def __init__(self, db_path: Path = DB_PATH):
+    # db files whose schema this process already ensured (skip the DDL next time)
+    _initialized_paths: set = set()
+
+    def __init__(self, db_path: Path = DB_PATH, pragmas: Optional[Dict[str, Any]] = None):
         """Constructor method
 
         Parameters
         ----------
         db_path : Path, optional
             Path to the SQLite database file (defaults to DB_PATH).
+        pragmas : dict, optional
+            Per-connection PRAGMAs to override/add on top of the defaults, e.g.
+            ``{"synchronous": "FULL"}`` when every commit must survive power loss.
+
+        Raises
+        ------
+        ValueError
+            If a pragma name or value isn't a plain identifier/integer (they
+            can't be bound as parameters, so we refuse anything else).
         """
-        # connect to db and enforce foreign key constraints (otherwise cascades won't work)
         self.db_path = db_path
-        self.conn = sqlite3.connect(self.db_path)
-        self.conn.execute("PRAGMA foreign_keys = ON;")  # yeah this is important for FK checks
+        # isolation_level=None: autocommit, no implicit BEGINs sniffed by the driver;
+        # multi-statement work goes through transaction() (explicit BEGIN/COMMIT)
+        self.conn = sqlite3.connect(self.db_path, isolation_level=None)
+        # closes the connection even if nobody calls close() (e.g. an error path);
+        # must not reference self, or the repo could never be collected.
+        # Registered before any setup below so a failing setup can't leak it
+        self._finalizer = weakref.finalize(self, _close_connection, self.conn)
+        self._tx_depth = 0  # > 0 while inside transaction() (nesting depth)
+        try:
+            self._setup(db_path, pragmas)
+        except BaseException:
+            self._finalizer()  # close now, don't wait for the repo to be collected
+            raise
+
+    def _setup(self, db_path: Path, pragmas: Optional[Dict[str, Any]]) -> None:
+        """Apply the connection pragmas and make sure the schema exists (see ``__init__``)."""
+        # rows come back as sqlite3.Row (C-level, name + index access); public
+        # methods still hand out plain dicts via dict(row), the GUIs expect .get()
+        self.conn.row_factory = sqlite3.Row
+        # enforce foreign key constraints (otherwise cascades won't work),
+        # plus the speed-related per-connection pragmas
+        for name, value in {**_CONNECTION_PRAGMAS, **(pragmas or {})}.items():
+            if not name.isidentifier() or not (isinstance(value, int) or str(value).isidentifier()):
+                raise ValueError(f"Bad pragma: {name}={value!r}")
+            self.conn.execute(f"PRAGMA {name} = {value};")
+        # same DDL as init_db (IF NOT EXISTS), so a fresh db file is usable right away;
+        # only once per file per process (":memory:" dbs are always new, so always run).
+        # The path alone can go stale (file deleted/recreated), so a cached path
+        # is only trusted if the tables are actually there (one sqlite_master probe)
+        key = str(Path(db_path).resolve()) if str(db_path) != ":memory:" else None
+        if (key is None or key not in SQLiteRepository._initialized_paths
+                or not self._schema_present()):
+            create_schema(self.conn)  # may also migrate old rowid tables (can raise)
+            if key is not None:
+                SQLiteRepository._initialized_paths.add(key)
+
+    # ---------- TRANSACTIONS ----------
+    @contextmanager
+    def transaction(self, immediate: bool = False) -> Iterator[sqlite3.Connection]:
+        """Group several repository calls into one transaction (one commit).
+
+        Parameters
+        ----------
+        immediate : bool, optional
+            Start with ``BEGIN IMMEDIATE`` (take the write lock right away) instead
+            of a plain deferred ``BEGIN``. Only matters for the outermost block.
+
+        Returns
+        -------
+        Iterator[sqlite3.Connection]
+            Context manager yielding the underlying connection.
+
+        Examples
+        --------
+        >>> with repo.transaction():
+        ...     for s in students:
+        ...         repo.add_student(s.student_id, s.name, s.age, s.email)
+
+        Notes
+        -----
+        - The connection is in autocommit mode (``isolation_level=None``), so on
+          their own ``add_*``/``update_*``/``delete_*``/``register_*`` commit as
+          they run. Inside the block they join this transaction instead and the
+          outermost block commits once at the end (one fsync, not N).
+        - Any exception rolls back everything since the outermost block started.
+        - Blocks can be nested; only the outermost one begins/commits/rolls back.
+        """
+        if not self._tx_depth:
+            self.conn.execute("BEGIN IMMEDIATE;" if immediate else "BEGIN;")
+        self._tx_depth += 1
+        try:
+            yield self.conn
+        except BaseException:
+            self._tx_depth -= 1
+            if not self._tx_depth:
+                self.conn.execute("ROLLBACK;")
+            raise
+        self._tx_depth -= 1
+        if not self._tx_depth:
+            try:
+                self.conn.execute("COMMIT;")
+            except sqlite3.Error:
+                self.conn.execute("ROLLBACK;")  # e.g. deferred FK failure: don't leave it open
+                raise
 
     # ---------- STUDENTS ----------
     def add_student(self, student_id: str, name: str, age: int, email: str) -> None:
@@ -75,13 +332,37 @@ class SQLiteRepository:
             "INSERT INTO STUDENTS (student_id, name, age, email) VALUES (?, ?, ?, ?)",
             (student_id, name, age, email),
         )
-        self.conn.commit()
+
+    def add_students_bulk(self, rows: Iterable[Tuple[str, str, int, str]]) -> None:
+        """Insert many students with one ``executemany`` in one transaction.
+
+        Parameters
+        ----------
+        rows : Iterable[tuple[str, str, int, str]]
+            ``(student_id, name, age, email)`` tuples (same order as ``add_student``).
+
+        Returns
+        -------
+        None
+
+        Notes
+        -----
+        - All-or-nothing: a duplicate ID rolls back the whole batch.
+        - The statement is prepared once and all rows are bound in C (no per-row
+          Python call or commit like a loop over ``add_student`` would do).
+        """
+        with self.transaction():
+            self.conn.executemany(
+                "INSERT INTO STUDENTS (student_id, name, age, email) VALUES (?, ?, ?, ?)", rows
+            )
+
+    def iter_students(self) -> Iterator[Dict[str, Any]]:
+        """Yield students one dict at a time, sorted by name (see ``_iter_rows``)."""
+        return self._iter_rows(_SELECT["STUDENTS"] + " ORDER BY name ASC")
 
     def get_all_students(self) -> List[Dict[str, Any]]:
         """Return all students as a list of dictionaries sorted by name."""
-        cur = self.conn.execute("SELECT * FROM STUDENTS ORDER BY name ASC")
-        cols = [c[0] for c in cur.description]
-        return [dict(zip(cols, row)) for row in cur.fetchall()]
+        return list(self.iter_students())
 
     def update_student(self, student_id: str, name: Optional[str] = None,
                        age: Optional[int] = None, email: Optional[str] = None) -> None:
@@ -105,19 +386,37 @@ class SQLiteRepository:
         """
         # collect only the fields that are passed (otherwise no-op)
         fields, values = [], []
-        if name: fields.append("name=?"); values.append(name)  # quick and simple
-        if age is not None: fields.append("age=?"); values.append(age)
-        if email: fields.append("email=?"); values.append(email)
+        if name: fields.append("name"); values.append(name)  # quick and simple
+        if age is not None: fields.append("age"); values.append(age)
+        if email: fields.append("email"); values.append(email)
         if not fields: return  # nothing to update -> silently return (simple pattern)
         values.append(student_id)
-        self.conn.execute(f"UPDATE STUDENTS SET {', '.join(fields)} WHERE student_id=?", values)
-        self.conn.commit()
+        self.conn.execute(_UPDATE_SQL["STUDENTS"][tuple(fields)], values)
+
+    def add_instructors_bulk(self, rows: Iterable[Tuple[str, str, int, str]]) -> None:
+        """Insert many instructors in one transaction (see ``add_students_bulk``).
+
+        Parameters
+        ----------
+        rows : Iterable[tuple[str, str, int, str]]
+            ``(instructor_id, name, age, email)`` tuples.
+
+        Returns
+        -------
+        None
+        """
+        with self.transaction():
+            self.conn.executemany(
+                "INSERT INTO INSTRUCTORS (instructor_id, name, age, email) VALUES (?, ?, ?, ?)", rows
+            )
+
+    def iter_instructors(self) -> Iterator[Dict[str, Any]]:
+        """Yield instructors one dict at a time, sorted by name."""
+        return self._iter_rows(_SELECT["INSTRUCTORS"] + " ORDER BY name ASC")
 
     def get_all_instructors(self) -> List[Dict[str, Any]]:
         """Return all instructors as a list of dictionaries sorted by name."""
-        cur = self.conn.execute("SELECT * FROM INSTRUCTORS ORDER BY name ASC")
-        cols = [c[0] for c in cur.description]
-        return [dict(zip(cols, row)) for row in cur.fetchall()]
+        return list(self.iter_instructors())
 
     def delete_student(self, student_id: str) -> None:
         """Delete a student record.
@@ -133,7 +432,6 @@ class SQLiteRepository:
         """
         # straight delete by id (no soft-delete here)
         self.conn.execute("DELETE FROM STUDENTS WHERE student_id=?", (student_id,))
-        self.conn.commit()
 
     def get_student(self, student_id: str) -> Optional[Dict[str, Any]]:
         """Fetch student record by ID.
@@ -148,9 +446,9 @@ class SQLiteRepository:
         dict or None
             Dictionary with student info or None if not found.
         """
-        cur = self.conn.execute("SELECT * FROM STUDENTS WHERE student_id=?", (student_id,))
+        cur = self.conn.execute(_SELECT["STUDENTS"] + " WHERE student_id=?", (student_id,))
         row = cur.fetchone()
-        return dict(zip([c[0] for c in cur.description], row)) if row else None  # dictify because nicer
+        return dict(row) if row else None  # dictify because nicer
 
     # ---------- INSTRUCTORS ----------
     def add_instructor(self, instructor_id: str, name: str, age: int, email: str) -> None:
@@ -175,7 +473,6 @@ class SQLiteRepository:
             "INSERT INTO INSTRUCTORS (instructor_id, name, age, email) VALUES (?, ?, ?, ?)",
             (instructor_id, name, age, email),
         )
-        self.conn.commit()
 
     def update_instructor(self, instructor_id: str, name: Optional[str] = None,
                           age: Optional[int] = None, email: Optional[str] = None) -> None:
@@ -198,13 +495,12 @@ class SQLiteRepository:
         """
         # same update pattern as students (keep it consistent)
         fields, values = [], []
-        if name: fields.append("name=?"); values.append(name)
-        if age is not None: fields.append("age=?"); values.append(age)
-        if email: fields.append("email=?"); values.append(email)
+        if name: fields.append("name"); values.append(name)
+        if age is not None: fields.append("age"); values.append(age)
+        if email: fields.append("email"); values.append(email)
         if not fields: return
         values.append(instructor_id)
-        self.conn.execute(f"UPDATE INSTRUCTORS SET {', '.join(fields)} WHERE instructor_id=?", values)
-        self.conn.commit()
+        self.conn.execute(_UPDATE_SQL["INSTRUCTORS"][tuple(fields)], values)
 
     def delete_instructor(self, instructor_id: str) -> None:
         """Delete an instructor by ID.
@@ -219,7 +515,6 @@ class SQLiteRepository:
         None
         """
         self.conn.execute("DELETE FROM INSTRUCTORS WHERE instructor_id=?", (instructor_id,))
-        self.conn.commit()
 
     def get_instructor(self, instructor_id: str) -> Optional[Dict[str, Any]]:
         """Fetch instructor record.
@@ -234,9 +529,9 @@ class SQLiteRepository:
         dict or None
             Dictionary with instructor details or None.
         """
-        cur = self.conn.execute("SELECT * FROM INSTRUCTORS WHERE instructor_id=?", (instructor_id,))
+        cur = self.conn.execute(_SELECT["INSTRUCTORS"] + " WHERE instructor_id=?", (instructor_id,))
         row = cur.fetchone()
-        return dict(zip([c[0] for c in cur.description], row)) if row else None  # same dictify trick
+        return dict(row) if row else None  # same dictify trick
 
     # ---------- COURSES ----------
     def add_course(self, course_id: str, course_name: str, i_id: Optional[str] = None) -> None:
@@ -259,7 +554,6 @@ class SQLiteRepository:
             "INSERT INTO COURSES (course_id, course_name, i_id) VALUES (?, ?, ?)",
             (course_id, course_name, i_id),
         )
-        self.conn.commit()
 
     def update_course(self, course_id: str, course_name: Optional[str] = None,
                       i_id: Optional[str] = None) -> None:
@@ -280,12 +574,11 @@ class SQLiteRepository:
         """
         # update only provided fields (same pattern again)
         fields, values = [], []
-        if course_name: fields.append("course_name=?"); values.append(course_name)
-        if i_id is not None: fields.append("i_id=?"); values.append(i_id)
+        if course_name: fields.append("course_name"); values.append(course_name)
+        if i_id is not None: fields.append("i_id"); values.append(i_id)
         if not fields: return
         values.append(course_id)
-        self.conn.execute(f"UPDATE COURSES SET {', '.join(fields)} WHERE course_id=?", values)
-        self.conn.commit()
+        self.conn.execute(_UPDATE_SQL["COURSES"][tuple(fields)], values)
 
     def delete_course(self, course_id: str) -> None:
         """Delete a course.
@@ -300,7 +593,6 @@ class SQLiteRepository:
         None
         """
         self.conn.execute("DELETE FROM COURSES WHERE course_id=?", (course_id,))
-        self.conn.commit()
 
     def get_course(self, course_id: str) -> Optional[Dict[str, Any]]:
         """Fetch a course record.
@@ -315,15 +607,34 @@ class SQLiteRepository:
         dict or None
             Dictionary with course data or None.
         """
-        cur = self.conn.execute("SELECT * FROM COURSES WHERE course_id=?", (course_id,))
+        cur = self.conn.execute(_SELECT["COURSES"] + " WHERE course_id=?", (course_id,))
         row = cur.fetchone()
-        return dict(zip([c[0] for c in cur.description], row)) if row else None  # keep consistent
+        return dict(row) if row else None  # keep consistent
+
+    def add_courses_bulk(self, rows: Iterable[Tuple[str, str, Optional[str]]]) -> None:
+        """Insert many courses in one transaction (see ``add_students_bulk``).
+
+        Parameters
+        ----------
+        rows : Iterable[tuple[str, str, str or None]]
+            ``(course_id, course_name, i_id)`` tuples; ``i_id`` may be None.
+
+        Returns
+        -------
+        None
+        """
+        with self.transaction():
+            self.conn.executemany(
+                "INSERT INTO COURSES (course_id, course_name, i_id) VALUES (?, ?, ?)", rows
+            )
+
+    def iter_courses(self) -> Iterator[Dict[str, Any]]:
+        """Yield courses one dict at a time, sorted by course_id."""
+        return self._iter_rows(_SELECT["COURSES"] + " ORDER BY course_id ASC")
 
     def get_all_courses(self) -> List[Dict[str, Any]]:
         """Return all courses as a list of dictionaries sorted by course_id."""
-        cur = self.conn.execute("SELECT * FROM COURSES ORDER BY course_id ASC")
-        cols = [c[0] for c in cur.description]
-        return [dict(zip(cols, row)) for row in cur.fetchall()]
+        return list(self.iter_courses())
 
     # ---------- REGISTRATION ----------
     def register_student(self, s_id: str, c_id: str) -> None:
@@ -345,13 +656,20 @@ class SQLiteRepository:
         -------
         None
         """
-        # Ensure both exist first (otherwise FK error or logical error)
-        if not self.get_student(s_id): raise ValueError("Student does not exist")
-        if not self.get_course(c_id): raise ValueError("Course does not exist")
-        self.conn.execute(
-            "INSERT OR IGNORE INTO REGISTRATION (s_id, c_id) VALUES (?, ?)", (s_id, c_id)
+        # One round trip on the happy path: the existence checks ride along in the INSERT
+        cur = self.conn.execute(
+            "INSERT OR IGNORE INTO REGISTRATION (s_id, c_id) SELECT ?, ? "
+            "WHERE EXISTS (SELECT 1 FROM STUDENTS WHERE student_id=?) "
+            "AND EXISTS (SELECT 1 FROM COURSES WHERE course_id=?)",
+            (s_id, c_id, s_id, c_id),
         )
-        self.conn.commit()
+        if cur.rowcount == 0:
+            # nothing inserted: a missing student/course, or already registered (fine).
+            # only now do we spend the extra probes to say which one it was
+            if not self._exists("SELECT 1 FROM STUDENTS WHERE student_id=?", s_id):
+                raise ValueError("Student does not exist")
+            if not self._exists("SELECT 1 FROM COURSES WHERE course_id=?", c_id):
+                raise ValueError("Course does not exist")
 
     def unregister_student(self, s_id: str, c_id: str) -> None:
         """Unregister a student from a course.
@@ -368,7 +686,40 @@ class SQLiteRepository:
         None
         """
         self.conn.execute("DELETE FROM REGISTRATION WHERE s_id=? AND c_id=?", (s_id, c_id))
-        self.conn.commit()
+
+    def register_students_bulk(self, rows: Iterable[Tuple[str, str]]) -> None:
+        """Register many (student, course) pairs in one transaction.
+
+        Parameters
+        ----------
+        rows : Iterable[tuple[str, str]]
+            ``(s_id, c_id)`` pairs.
+
+        Returns
+        -------
+        None
+
+        Raises
+        ------
+        sqlite3.IntegrityError
+            If a pair points to a missing student/course (nothing is written then).
+
+        Notes
+        -----
+        - Duplicate pairs are ignored, like ``register_student``.
+        - No per-row existence checks here; the FKs catch bad IDs in one go.
+        """
+        with self.transaction():
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO REGISTRATION (s_id, c_id) VALUES (?, ?)", rows
+            )
+
+    def iter_registrations(self, s_id: Optional[str] = None,
+                           c_id: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """Yield registrations one dict at a time (same filters as ``get_registrations``)."""
+        # only 4 possible shapes -> pick the prebuilt one (empty filters are ignored)
+        params = tuple(v for v in (s_id, c_id) if v)
+        return self._iter_rows(_REGISTRATION_SQL[bool(s_id), bool(c_id)], params)
 
     def get_registrations(self, s_id: Optional[str] = None, c_id: Optional[str] = None) -> List[Dict[str, Any]]:
         """Fetch registrations with optional filters.
@@ -385,16 +736,88 @@ class SQLiteRepository:
         list
             List of registration records as dictionaries.
         """
-        # build a small dynamic WHERE (not the fanciest way, but okay for the lab)
-        q = "SELECT * FROM REGISTRATION WHERE 1=1"
-        params: List[Any] = []
-        if s_id:
-            q += " AND s_id=?"; params.append(s_id)
-        if c_id:
-            q += " AND c_id=?"; params.append(c_id)
-        cur = self.conn.execute(q, params)
-        cols = [c[0] for c in cur.description]
-        return [dict(zip(cols, row)) for row in cur.fetchall()]
+        return list(self.iter_registrations(s_id, c_id))
+
+    def _schema_present(self) -> bool:
+        """Return True if all four tables exist in the open database file."""
+        found = self.conn.execute(_SCHEMA_PROBE_SQL, tuple(_TABLE_COLUMNS)).fetchone()[0]
+        return found == len(_TABLE_COLUMNS)
+
+    def _exists(self, sql: str, key: str) -> bool:
+        """Return True if ``sql`` (a ``SELECT 1 ... WHERE pk=?`` probe) finds a row."""
+        return self.conn.execute(sql, (key,)).fetchone() is not None
+
+    def _iter_rows(self, sql: str, params: Iterable[Any] = ()) -> Iterator[Dict[str, Any]]:
+        """Run a SELECT and lazily yield each row as a dict.
+
+        Parameters
+        ----------
+        sql : str
+            SELECT statement to run.
+        params : Iterable, optional
+            Bound parameters for ``sql``.
+
+        Returns
+        -------
+        Iterator[dict]
+            One dictionary per row, built only when the caller asks for it.
+
+        Notes
+        -----
+        - The statement runs right away (so bad SQL fails at the call site), but
+          rows are stepped from the cursor one by one instead of ``fetchall()``,
+          so exporting a big table never holds the whole table in memory.
+        - Don't write through ``self.conn`` while still iterating (plain SQLite rule).
+        """
+        cur = self.conn.execute(sql, tuple(params))
+        return (dict(row) for row in cur)
+
+    # ---------- BULK SAVE ----------
+    def bulk_save(self, students: Iterable["Student"], instructors: Iterable["Instructor"],
+                  courses: Iterable["Course"]) -> None:
+        """Persist domain objects in one transaction (one commit for everything).
+
+        Parameters
+        ----------
+        students : Iterable[Student]
+            Students to insert (existing IDs are left untouched).
+        instructors : Iterable[Instructor]
+            Instructors to insert (existing IDs are left untouched).
+        courses : Iterable[Course]
+            Courses to upsert; their ``enrolled_students`` become registrations.
+
+        Returns
+        -------
+        None
+
+        Notes
+        -----
+        - Same semantics the GUI import had with per-row calls: people are
+          skipped if they exist, courses are updated (instructor only if given),
+          duplicate registrations are ignored.
+        - Uses ``executemany`` per table; if anything fails, nothing is written.
+        """
+        courses = list(courses)  # iterated twice below (courses + registrations)
+        with self.transaction():
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO STUDENTS (student_id, name, age, email) VALUES (?, ?, ?, ?)",
+                [(s.student_id, s.name, s.age, s.email) for s in students],
+            )
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO INSTRUCTORS (instructor_id, name, age, email) VALUES (?, ?, ?, ?)",
+                [(i.instructor_id, i.name, i.age, i.email) for i in instructors],
+            )
+            self.conn.executemany(
+                "INSERT INTO COURSES (course_id, course_name, i_id) VALUES (?, ?, ?) "
+                "ON CONFLICT(course_id) DO UPDATE SET "
+                "course_name=excluded.course_name, i_id=COALESCE(excluded.i_id, i_id)",
+                [(c.course_id, c.course_name, c.instructor.instructor_id if c.instructor else None)
+                 for c in courses],
+            )
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO REGISTRATION (s_id, c_id) VALUES (?, ?)",
+                [(s.student_id, c.course_id) for c in courses for s in c.enrolled_students],
+            )
 
     # ---------- SEARCH / FILTER ----------
     def search(self, table: str, **kwargs) -> List[Dict[str, Any]]:
@@ -415,32 +838,85 @@ class SQLiteRepository:
         Raises
         ------
         ValueError
-            If table name is invalid.
+            If table name is invalid, or a filter isn't a column of that table.
+
+        Notes
+        -----
+        - Column names are checked against the table's columns before they go
+          into the SQL, so kwargs can't inject anything.
+        - Filters are sorted, so the same set of columns always maps to the same
+          (cached) SQL string regardless of kwarg order.
         """
         # Example usage: repo.search('STUDENTS', name='John') -> fuzzy match on name
-        if table not in ("STUDENTS", "INSTRUCTORS", "COURSES", "REGISTRATION"):
+        if table not in _TABLE_COLUMNS:
             raise ValueError("Invalid table name")
-        q = f"SELECT * FROM {table} WHERE 1=1"
-        params = []
-        for k, v in kwargs.items():
-            q += f" AND {k} LIKE ?"
-            params.append(f"%{v}%")
-        cur = self.conn.execute(q, params)
-        cols = [c[0] for c in cur.description]
-        return [dict(zip(cols, row)) for row in cur.fetchall()]
-
-    def backup(self, dest_path: str | os.PathLike) -> str:
+        unknown = kwargs.keys() - set(_TABLE_COLUMNS[table])
+        if unknown:
+            raise ValueError(f"Unknown column(s) for {table}: {', '.join(sorted(unknown))}")
+        keys = tuple(sorted(kwargs))
+        params = [f"%{kwargs[k]}%" for k in keys]
+        cur = self.conn.execute(_search_sql(table, keys), params)
+        return [dict(row) for row in cur]
+
+    def search_all(self, query: str, kinds: Iterable[str] = SEARCH_KINDS) -> List[Dict[str, Any]]:
+        """Fuzzy search students, instructors, and courses by name or ID at once.
+
+        Parameters
+        ----------
+        query : str
+            Text to look for (substring match, case-insensitive for ASCII).
+        kinds : Iterable[str], optional
+            Which of 'Student', 'Instructor', 'Course' to search (default: all).
+            Tables that aren't asked for are left out of the SQL entirely.
+
+        Returns
+        -------
+        list
+            Rows as dictionaries with keys ``type`` ('Student', 'Instructor' or
+            'Course'), ``name``, ``id_number``, ``email``, and ``age``.
+
+        Notes
+        -----
+        - Single ``UNION ALL`` query instead of one ``search`` call per column.
+        - A record matching on both name and ID is returned only once.
+        - Courses have no email/age, so those come back as empty strings.
+        - Results are grouped students, instructors, courses (explicit
+          ``ORDER BY`` on the type); order inside a group isn't specified.
+
+        Raises
+        ------
+        ValueError
+            If ``kinds`` is empty or contains an unknown kind.
+        """
+        kinds = tuple(sorted(set(kinds)))  # normalized -> one cache entry per combination
+        if not kinds or not set(kinds) <= set(SEARCH_KINDS):
+            raise ValueError(f"kinds must be a non-empty subset of {SEARCH_KINDS}")
+        cur = self.conn.execute(_search_all_sql(kinds), {"q": f"%{query}%"})
+        return [dict(row) for row in cur]
+
+    def backup(self, dest_path: str | os.PathLike, compact: bool = False) -> str:
         """Backup the database to a new file.
 
         Parameters
         ----------
         dest_path : str or Path
             Destination path (can be a directory or a file; if no extension, '.sqlite' is enforced).
+        compact : bool, optional
+            Use ``VACUUM INTO`` instead of the backup API: the copy is rebuilt
+            without free pages (smaller file, written once). Default ``False``.
 
         Returns
         -------
         str
             Absolute path of the backup file.
+
+        Notes
+        -----
+        - The backup API copies all pages in one step (``pages=-1``, the default).
+        - Both modes write ``<dest>.part`` first and ``os.replace`` it over
+          ``dest`` at the end, so a failed backup never leaves a truncated file
+          at the real path (and an older backup there survives).
+        - Neither works inside ``transaction()`` (VACUUM can't run in a transaction).
         """
         dest = Path(dest_path)
         dest.parent.mkdir(parents=True, exist_ok=True)
@@ -449,30 +925,78 @@ class SQLiteRepository:
         if dest.suffix.lower() not in {".sqlite", ".db"}:
             dest = dest.with_suffix(".sqlite")  # I like .sqlite, but either works
 
-        # Perform the backup (this uses SQLite's built-in backup API)
-        with sqlite3.connect(dest) as backup_conn:
-            # This copies the full database into `dest`
-            self.conn.backup(backup_conn)
+        tmp = dest.with_suffix(dest.suffix + ".part")
+        tmp.unlink(missing_ok=True)  # leftover from a crashed run; VACUUM INTO won't overwrite
+        try:
+            if compact:
+                # reads one consistent snapshot (WAL) and writes a defragmented copy
+                self.conn.execute("VACUUM INTO ?", (str(tmp),))
+            else:
+                backup_conn = sqlite3.connect(tmp)
+                try:
+                    # fresh scratch file: no rollback journal needed while copying
+                    backup_conn.execute("PRAGMA journal_mode = OFF")
+                    # Perform the backup (this uses SQLite's built-in backup API)
+                    self.conn.backup(backup_conn)
+                finally:
+                    backup_conn.close()  # must be closed before the rename
+            os.replace(tmp, dest)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
 
         return str(dest.resolve())
 
+    def restore(self, src_path: str | os.PathLike) -> None:
+        """Replace the current database contents with a backup file.
+
+        Parameters
+        ----------
+        src_path : str or Path
+            Backup file to restore from (e.g. one written by ``backup``).
+
+        Returns
+        -------
+        None
+
+        Raises
+        ------
+        FileNotFoundError
+            If ``src_path`` does not exist (we don't want sqlite to create it).
+
+        Notes
+        -----
+        - Uses the backup API in reverse (backup file -> our connection), so SQLite
+          handles locking and the WAL; no raw file copy over a live database.
+        - The connection stays open, so callers don't need to reconnect.
+        - The backup may predate the current schema (rowid tables, missing
+          indexes), so ``create_schema`` runs again on the restored contents;
+          ``_initialized_paths`` would otherwise skip it for this file.
+        """
+        src = Path(src_path)
+        if not src.is_file():
+            raise FileNotFoundError(src)
+        src_conn = sqlite3.connect(src)
+        try:
+            src_conn.backup(self.conn)
+        finally:
+            src_conn.close()
+        create_schema(self.conn)
+
     # ---------- JSON IMPORT / EXPORT ----------
-    def export_to_json(self, dest_path: Optional[str] = None) -> str:
+    def export_to_json(self, dest_path: Optional[str] = None, pretty: bool = True) -> str:
         """Export full database (students, instructors, courses, registrations) to JSON.
 
         If ``dest_path`` is not provided, a timestamped file is created next to the DB.
+        Pass ``pretty=False`` for compact output (no indentation/spaces) when the file
+        is only meant for ``import_from_json``.
         Returns the absolute path to the written JSON file.
+
+        Rows are streamed from the cursors straight into the file (one row in
+        memory at a time); the output is the same as ``json.dump`` of the full dict.
         """
-        import json
         from datetime import datetime
 
-        data = {
-            "students": self.get_all_students(),
-            "instructors": self.get_all_instructors(),
-            "courses": self.get_all_courses(),
-            "registrations": self.get_registrations(),
-        }
-
         if dest_path is None:
             ts = datetime.now().strftime("%Y%m%d_%H%M%S")
             dest = (self.db_path.parent / f"export_{ts}.json").resolve()
@@ -480,67 +1004,108 @@ class SQLiteRepository:
             dest = Path(dest_path).resolve()
             dest.parent.mkdir(parents=True, exist_ok=True)
 
+        tables = (
+            ("students", self.iter_students),
+            ("instructors", self.iter_instructors),
+            ("courses", self.iter_courses),
+            ("registrations", self.iter_registrations),
+        )
         with open(dest, "w", encoding="utf-8") as fp:
-            json.dump(data, fp, ensure_ascii=False, indent=2)
+            _dump_tables(fp, tables, pretty)
 
         return str(dest)
 
     def import_from_json(self, src_path: str) -> bool:
         """Import database content from a JSON file produced by :meth:`export_to_json`.
 
-        This replaces existing data. Returns True on success, False otherwise.
+        This replaces existing data. Returns True on success, False otherwise
+        (bad file, or references to missing students/courses/instructors; the
+        old data is kept then).
+        Must not be called inside :meth:`transaction` (it runs its own).
         """
-        import json
+        if self._tx_depth:
+            raise RuntimeError("import_from_json can't run inside transaction()")
         p = Path(src_path)
         if not p.exists():
             return False
-        with open(p, "r", encoding="utf-8") as fp:
-            payload = json.load(fp)
 
+        cur = self.conn.cursor()
         try:
-            cur = self.conn.cursor()
-            cur.execute("PRAGMA foreign_keys = OFF;")
-            # wipe existing data (order matters due to FKs)
-            cur.execute("DELETE FROM REGISTRATION;")
-            cur.execute("DELETE FROM COURSES;")
-            cur.execute("DELETE FROM INSTRUCTORS;")
-            cur.execute("DELETE FROM STUDENTS;")
-
-            # re-insert in safe order: STUDENTS, INSTRUCTORS, COURSES, REGISTRATION
-            for s in payload.get("students", []):
-                cur.execute(
-                    "INSERT INTO STUDENTS (student_id, name, age, email) VALUES (?, ?, ?, ?)",
-                    (s["student_id"], s["name"], int(s["age"]), s["email"]),
+            # parse inside the try: a malformed file is a "bad file" too (-> False)
+            if orjson is not None:
+                payload = orjson.loads(p.read_bytes())
+            else:
+                with open(p, "r", encoding="utf-8") as fp:
+                    payload = json.load(fp)
+
+            # transaction() commits once at the end (single fsync for the whole
+            # import) and rolls back on error; the bulk helpers join it.
+            # IMMEDIATE -> take the write lock up front
+            with self.transaction(immediate=True):
+                # FKs stay on but are only checked at COMMIT (the pragma resets
+                # itself when the transaction ends), so a file with dangling
+                # references is rejected as a whole instead of half-loaded
+                cur.execute("PRAGMA defer_foreign_keys = ON;")
+                # wipe existing data (order matters due to FKs)
+                cur.execute("DELETE FROM REGISTRATION;")
+                cur.execute("DELETE FROM COURSES;")
+                cur.execute("DELETE FROM INSTRUCTORS;")
+                cur.execute("DELETE FROM STUDENTS;")
+
+                # re-insert in safe order: STUDENTS, INSTRUCTORS, COURSES, REGISTRATION
+                # (one executemany per table -> the statement is prepared once per table)
+                # ages from our own exports are already ints; only coerce the odd string
+                self.add_students_bulk(
+                    (s["student_id"], s["name"],
+                     s["age"] if isinstance(s["age"], int) else int(s["age"]), s["email"])
+                    for s in payload.get("students", [])
                 )
-            for i in payload.get("instructors", []):
-                cur.execute(
-                    "INSERT INTO INSTRUCTORS (instructor_id, name, age, email) VALUES (?, ?, ?, ?)",
-                    (i["instructor_id"], i["name"], int(i["age"]), i["email"]),
+                self.add_instructors_bulk(
+                    (i["instructor_id"], i["name"],
+                     i["age"] if isinstance(i["age"], int) else int(i["age"]), i["email"])
+                    for i in payload.get("instructors", [])
                 )
-            for c in payload.get("courses", []):
-                cur.execute(
-                    "INSERT INTO COURSES (course_id, course_name, i_id) VALUES (?, ?, ?)",
-                    (c["course_id"], c["course_name"], c.get("i_id")),
+                self.add_courses_bulk(
+                    (c["course_id"], c["course_name"], c.get("i_id"))
+                    for c in payload.get("courses", [])
                 )
-            for r in payload.get("registrations", []):
-                cur.execute(
-                    "INSERT OR IGNORE INTO REGISTRATION (s_id, c_id) VALUES (?, ?)",
-                    (r["s_id"], r["c_id"]),
+                self.register_students_bulk(
+                    (r["s_id"], r["c_id"]) for r in payload.get("registrations", [])
                 )
-
-            cur.execute("PRAGMA foreign_keys = ON;")
-            self.conn.commit()
-            return True
         except Exception:
-            self.conn.rollback()
             return False
+        # a full reload leaves a big -wal file; fold it back into the db once, now
+        # (no-op if the file isn't in WAL mode)
+        self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE);")
+        return True
 
     def close(self):
         """Close the database connection.
 
+        Runs ``PRAGMA optimize`` first, as SQLite recommends before closing.
+        Safe to call more than once (only the first call does anything).
+
+        Returns
+        -------
+        None
+        """
+        self._finalizer()  # same callback the GC would run; finalize runs it once
+
+    def __enter__(self) -> "SQLiteRepository":
+        """Use the repository as a context manager (``with SQLiteRepository() as repo:``).
+
+        Returns
+        -------
+        SQLiteRepository
+            This repository.
+        """
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        """Close the connection when the ``with`` block ends (errors still propagate).
+
         Returns
         -------
         None
         """
-        # close politely (always a good idea)
-        self.conn.close()
+        self.close()
@@ -1,14 +1,15 @@
 import sys
 import json
 import csv
+import re
 import sqlite3
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QTabWidget, QVBoxLayout, QHBoxLayout,
-    QLabel, QLineEdit, QPushButton, QComboBox, QTableWidget, QTableWidgetItem,
+    QLabel, QLineEdit, QPushButton, QComboBox, QTableView,
     QMessageBox, QFileDialog, QHeaderView,QInputDialog, QDialog
 )
 from PyQt5.QtGui import QFont, QColor, QPalette
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QObject, QRunnable, QThreadPool, QTimer, pyqtSignal, pyqtSlot
 import sys
 import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
@@ -18,6 +19,9 @@ from src.models import Instructor
 from src.models import Course
 from db.sqlite_repo import SQLiteRepository
 
+# compiled once at import; validate_email just calls .match()
+EMAIL_PATTERN = re.compile(r"[^@]+@[^@]+\.[^@]+")
+
 PRIMARY_COLOR = "#840132"
 TEXT_COLOR = "#ffffff"
 BG_COLOR = "#f0f4f7"
@@ -99,6 +103,137 @@ class EditDialog(QDialog):
         :rtype: list[str]"""
         return [self.edits[label].text().strip() for label in self.edits]
 
+class WorkerSignals(QObject):
+    """Signals a :class:`DBWorker` uses to report back to the GUI thread.
+    :ivar finished: Emitted with (title, message) when the job succeeds
+    :ivar failed: Emitted with (title, error text) when the job raises"""
+    finished = pyqtSignal(str, str)
+    failed = pyqtSignal(str, str)
+
+class DBWorker(QRunnable):
+    """Runs a slow database job (export, backup) on a thread pool thread.
+    sqlite3 connections can't be shared across threads, so the job gets its own
+    :class:`SQLiteRepository` on the same file (WAL lets it read while the GUI writes).
+    :param db_path: Path of the database file to open
+    :type db_path: str or Path
+    :param title: Short name of the job, used in the result/error message
+    :type title: str
+    :param job: Callable taking the repository and returning a message for the user
+    :type job: callable"""
+
+    def __init__(self, db_path, title, job):
+        super().__init__()
+        self.db_path = db_path
+        self.title = title
+        self.job = job
+        self.signals = WorkerSignals()
+
+    def run(self):
+        """Open the repository, run the job and emit the outcome."""
+        try:
+            with SQLiteRepository(self.db_path) as db:
+                message = self.job(db)
+        except Exception as e:
+            self.signals.failed.emit(self.title, str(e))
+        else:
+            self.signals.finished.emit(self.title, message)
+
+RECORD_HEADERS = ["Type", "Name", "ID Number", "Email", "Age"]
+# refresh_table lists students first, then instructors, then courses
+RECORD_TYPE_ORDER = {"Student": 0, "Instructor": 1, "Course": 2}
+
+def record_sort_key(record):
+    """Position of a display record, matching refresh_table's ORDER BYs
+    (people by name, courses by course_id, within their type group).
+    :param record: A (type, name, id, email, age) tuple
+    :type record: tuple
+    :returns: Key that sorts records in display order
+    :rtype: tuple"""
+    typ = record[0]
+    return RECORD_TYPE_ORDER[typ], record[2] if typ == "Course" else record[1]
+
+class RecordsModel(QAbstractTableModel):
+    """Read-only table model behind the 'Display All' and 'Search' views.
+    Rows are plain tuples (type, name, id, email, age); Qt only asks for the cells
+    it actually paints, so no per-cell item objects are created.
+    :ivar rows: The records currently shown, in display order
+    :vartype rows: list[tuple]"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.rows = []
+
+    def rowCount(self, parent=QModelIndex()):
+        """Number of records (0 for child indexes, this is a flat table)."""
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        """Always the five RECORD_HEADERS columns."""
+        return 0 if parent.isValid() else len(RECORD_HEADERS)
+
+    def data(self, index, role=Qt.DisplayRole):
+        """Cell text for the display role; nothing for the other roles."""
+        if role == Qt.DisplayRole and index.isValid():
+            value = self.rows[index.row()][index.column()]
+            return "" if value is None else str(value)
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        """Column titles on top, 1-based row numbers on the side."""
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return RECORD_HEADERS[section]
+        return section + 1
+
+    def set_rows(self, rows):
+        """Replace all records at once (one model reset instead of a row insert each).
+        :param rows: The new records as (type, name, id, email, age) tuples
+        :type rows: list[tuple]"""
+        self.beginResetModel()
+        self.rows = rows
+        self.endResetModel()
+
+    def insert_record(self, record):
+        """Add one record where a full refresh_table would put it (see record_sort_key).
+        :param record: The new (type, name, id, email, age) tuple
+        :type record: tuple"""
+        # bisect_right by hand (bisect's key= needs Python 3.10)
+        key = record_sort_key(record)
+        lo, hi = 0, len(self.rows)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if key < record_sort_key(self.rows[mid]):
+                hi = mid
+            else:
+                lo = mid + 1
+        pos = lo
+        self.beginInsertRows(QModelIndex(), pos, pos)
+        self.rows.insert(pos, record)
+        self.endInsertRows()
+
+    def update_record(self, row, record):
+        """Replace the record at ``row``; repaint it in place, or move it if the
+        edit changed its sort position (e.g. a renamed student).
+        :param row: Row index of the record
+        :type row: int
+        :param record: The updated (type, name, id, email, age) tuple
+        :type record: tuple"""
+        if record_sort_key(record) != record_sort_key(self.rows[row]):
+            self.remove_record(row)
+            self.insert_record(record)
+            return
+        self.rows[row] = record
+        self.dataChanged.emit(self.index(row, 0), self.index(row, len(RECORD_HEADERS) - 1))
+
+    def remove_record(self, row):
+        """Remove the record at ``row``.
+        :param row: Row index of the record
+        :type row: int"""
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self.rows[row]
+        self.endRemoveRows()
+
 class SchoolManagementSystem(QMainWindow):
     """This is the main appication window for the School Management System.
     :ivar db: Database managrement instance used for CURD operations
@@ -111,6 +246,9 @@ class SchoolManagementSystem(QMainWindow):
         self.setGeometry(100, 100, 1100, 700)
         self.setStyleSheet(ROUNDED_STYLE)
         self.db = SQLiteRepository()
+        # one background thread: jobs run one at a time, off the event loop
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(1)
         self.init_ui()
 
     def init_ui(self):
@@ -345,10 +483,11 @@ class SchoolManagementSystem(QMainWindow):
     def setup_display_tab(self):
         """Set up the 'Display All' tab UI with a table to show all records and Edit/Delete buttons."""
         layout = QVBoxLayout()
-        self.table = QTableWidget(0, 5)
-        self.table.setHorizontalHeaderLabels(["Type", "Name", "ID Number", "Email", "Age"])
+        self.table_model = RecordsModel(self)
+        self.table = QTableView()
+        self.table.setModel(self.table_model)
         self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.setEditTriggers(QTableView.NoEditTriggers)
         layout.addWidget(self.table)
         btns = QHBoxLayout()
         edit_btn = QPushButton("Edit Selected")
@@ -368,12 +507,19 @@ class SchoolManagementSystem(QMainWindow):
         self.search_input = QLineEdit()
         search_btn = QPushButton("Search")
         search_btn.clicked.connect(self.search_records)
+        # search as you type, but only once typing pauses for 150 ms
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(150)
+        self.search_timer.timeout.connect(self.search_records)
+        self.search_input.textChanged.connect(self.search_timer.start)
         search_layout.addWidget(QLabel("Search:"))
         search_layout.addWidget(self.search_input)
         search_layout.addWidget(search_btn)
         layout.addLayout(search_layout)
-        self.search_table = QTableWidget(0, 5)
-        self.search_table.setHorizontalHeaderLabels(["Type", "Name", "ID Number", "Email", "Age"])
+        self.search_model = RecordsModel(self)
+        self.search_table = QTableView()
+        self.search_table.setModel(self.search_model)
         self.search_input.setPlaceholderText("Type name or ID to search...")
         self.search_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
         layout.addWidget(self.search_table)
@@ -405,7 +551,7 @@ class SchoolManagementSystem(QMainWindow):
             QMessageBox.warning(self, "Duplicate/Invalid", f"{e}")
             return
 
-        self.refresh_table()
+        self.table_model.insert_record(("Student", student.name, student.student_id, student.email, student.age))
         self.update_course_and_registration()
         self.student_name.clear(); self.student_age.clear(); self.student_email.clear(); self.student_id.clear()
 
@@ -435,7 +581,9 @@ class SchoolManagementSystem(QMainWindow):
             QMessageBox.warning(self, "Duplicate/Invalid", f"{e}")
             return
 
-        self.refresh_table()
+        self.table_model.insert_record(
+            ("Instructor", instructor.name, instructor.instructor_id, instructor.email, instructor.age)
+        )
         self.update_course_and_registration()
         self.instructor_name.clear(); self.instructor_age.clear(); self.instructor_email.clear(); self.instructor_id.clear()
 
@@ -475,7 +623,7 @@ class SchoolManagementSystem(QMainWindow):
             QMessageBox.warning(self, "Duplicate/Invalid", f"{e}")
             return
 
-        self.refresh_table()
+        self.table_model.insert_record(("Course", course.course_name, course.course_id, "", ""))
         self.update_course_and_registration()
         self.course_id.clear(); self.course_name.clear(); self.course_instructor.setCurrentIndex(-1)
 
@@ -510,65 +658,47 @@ class SchoolManagementSystem(QMainWindow):
 
     def refresh_table(self):
         """Refresh the display table with the latest data from the database."""
-
-        self.table.setRowCount(0)
-
-   
-        students = self.db.get_all_students()
-        for s in students:
-            self._add_table_row("Student", s["name"], s["student_id"], s["email"], s["age"])
-
-        instructors = self.db.get_all_instructors()
-        for i in instructors:
-            self._add_table_row("Instructor", i["name"], i["instructor_id"], i["email"], i["age"])
-
-        
-        courses = self.db.get_all_courses()
-        for c in courses:
-            self._add_table_row("Course", c["course_name"], c["course_id"], "", "")
-
-
-    def _add_table_row(self, typ, name, idnum, email, age):
-        """Helper method to add a row to the display table.
-        :param typ: The type of record (Student, Instructor, Course)
-        :type typ: str
-        :param name: The name of the person or course
-        :type name: str
-        :param idnum: The ID number of the person or course
-        :type idnum: str
-        :param email: The email of the person (empty for courses)
-        :type email: str
-        :param age: The age of the person (empty for courses)
-        :type age: str or int"""
-
-        row = self.table.rowCount()
-        self.table.insertRow(row)
-        self.table.setItem(row, 0, QTableWidgetItem(typ))
-        self.table.setItem(row, 1, QTableWidgetItem(name))
-        self.table.setItem(row, 2, QTableWidgetItem(idnum))
-        self.table.setItem(row, 3, QTableWidgetItem(email))
-        self.table.setItem(row, 4, QTableWidgetItem(str(age)))
+        rows = [("Student", s["name"], s["student_id"], s["email"], s["age"])
+                for s in self.db.iter_students()]
+        rows += [("Instructor", i["name"], i["instructor_id"], i["email"], i["age"])
+                 for i in self.db.iter_instructors()]
+        rows += [("Course", c["course_name"], c["course_id"], "", "")
+                 for c in self.db.iter_courses()]
+        self.table_model.set_rows(rows)
 
     def update_course_and_registration(self):
         """Update the course and registration dropdowns with the latest data from the database."""
-        self.course_instructor.clear()
-        instructors = self.db.get_all_instructors()
-        for instructor in instructors:
-            self.course_instructor.addItem(f"{instructor['name']} ({instructor['instructor_id']})", instructor['instructor_id'])
-
-    
-        self.reg_course.clear()
-        courses = self.db.get_all_courses()
-        for course in courses:
-            self.reg_course.addItem(f"{course['course_name']} ({course['course_id']})", course['course_id'])
+        self._fill_combo(self.course_instructor,
+                         [(f"{i['name']} ({i['instructor_id']})", i['instructor_id'])
+                          for i in self.db.iter_instructors()])
+        self._fill_combo(self.reg_course,
+                         [(f"{c['course_name']} ({c['course_id']})", c['course_id'])
+                          for c in self.db.iter_courses()])
+
+    def _fill_combo(self, combo, items):
+        """Replace the entries of a dropdown in one batch.
+        Signals are blocked while the list is rebuilt, so listeners (and the view)
+        see one change instead of one per entry.
+        :param combo: The dropdown to fill
+        :type combo: QComboBox
+        :param items: (label, data) pairs; data is what currentData() returns
+        :type items: list[tuple[str, str]]"""
+        combo.blockSignals(True)
+        try:
+            combo.clear()
+            combo.addItems([label for label, _ in items])
+            for index, (_, data) in enumerate(items):
+                combo.setItemData(index, data)
+        finally:
+            combo.blockSignals(False)
 
     def edit_selected(self):
         """Edit the selected record in the display table."""
-        row = self.table.currentRow()
+        row = self.table.currentIndex().row()
         if row < 0:
             QMessageBox.warning(self, "Select", "Select a record to edit.")
             return
-        typ = self.table.item(row, 0).text()
+        typ = self.table_model.rows[row][0]
         if typ == "Student":
             self._edit_student(row)
         elif typ == "Instructor":
@@ -578,7 +708,7 @@ class SchoolManagementSystem(QMainWindow):
 
     def _edit_student(self, row):
         """Edit a student record given the table row index."""
-        current_id = self.table.item(row, 2).text()
+        current_id = self.table_model.rows[row][2]
         student = self.db.get_student(current_id)
         if not student:
             QMessageBox.warning(self, "Not found", "Student not found in DB.")
@@ -596,7 +726,7 @@ class SchoolManagementSystem(QMainWindow):
                     QMessageBox.information(self, "Note", "Changing Student ID is not supported; updating other fields only.")
                 test_student = Student(name, int(age), email, current_id)
                 self.db.update_student(current_id, name=name, age=int(age), email=email)
-                self.refresh_table()
+                self.table_model.update_record(row, ("Student", name, current_id, email, int(age)))
             except ValueError as e:
                 QMessageBox.warning(self, "Validation Error", str(e))
                 return
@@ -607,7 +737,7 @@ class SchoolManagementSystem(QMainWindow):
 
     def _edit_instructor(self, row):
         """Edit an instructor record given the table row index."""
-        current_id = self.table.item(row, 2).text()
+        current_id = self.table_model.rows[row][2]
         instructor = self.db.get_instructor(current_id)
         if not instructor:
             QMessageBox.warning(self, "Not found", "Instructor not found in DB.")
@@ -626,7 +756,7 @@ class SchoolManagementSystem(QMainWindow):
                     QMessageBox.information(self, "Note", "Changing Instructor ID is not supported; updating other fields only.")
                 test_instructor = Instructor(name, int(age), email, current_id)
                 self.db.update_instructor(current_id, name=name, age=int(age), email=email)
-                self.refresh_table()
+                self.table_model.update_record(row, ("Instructor", name, current_id, email, int(age)))
                 self.update_course_and_registration()
             except ValueError as e:
                 QMessageBox.warning(self, "Validation Error", str(e))
@@ -637,13 +767,12 @@ class SchoolManagementSystem(QMainWindow):
 
     def delete_selected(self):
         """Delete the selected record from the display table and database."""
-        row = self.table.currentRow()
+        row = self.table.currentIndex().row()
         if row < 0:
             QMessageBox.warning(self, "Select", "Select a record to delete.")
             return
 
-        typ = self.table.item(row, 0).text()
-        idnum = self.table.item(row, 2).text()
+        typ, _, idnum = self.table_model.rows[row][:3]
 
         try:
             if typ == "Student":
@@ -669,7 +798,9 @@ class SchoolManagementSystem(QMainWindow):
             QMessageBox.critical(self, "Error", f"Delete failed: {e}")
             return
 
-        self.refresh_table()
+        # courses of a deleted instructor stay (i_id -> NULL) and the table
+        # doesn't show registrations, so only this one row changes
+        self.table_model.remove_record(row)
         self.update_course_and_registration()
 
 
@@ -677,30 +808,15 @@ class SchoolManagementSystem(QMainWindow):
         """Search records by name or ID and display results in the search table."""
         query = self.search_input.text().strip()
         if not query:
+            # box was cleared (search runs as you type): drop the stale results
+            self.search_model.set_rows([])
             return
-            
-        self.search_table.setRowCount(0)
-        # Aggregate simple fuzzy searches across tables
-        results = []
-        for row in self.db.search('STUDENTS', name=query) + self.db.search('STUDENTS', student_id=query):
-            results.append({'type': 'Student', 'name': row['name'], 'id_number': row['student_id'], 'email': row['email'], 'age': row['age']})
-        for row in self.db.search('INSTRUCTORS', name=query) + self.db.search('INSTRUCTORS', instructor_id=query):
-            results.append({'type': 'Instructor', 'name': row['name'], 'id_number': row['instructor_id'], 'email': row['email'], 'age': row['age']})
-        for row in self.db.search('COURSES', course_name=query) + self.db.search('COURSES', course_id=query):
-            results.append({'type': 'Course', 'name': row['course_name'], 'id_number': row['course_id'], 'email': '', 'age': ''})
-
-        for result in results:
-            self._add_search_row(result['type'], result['name'], result['id_number'], result.get('email', ''), result.get('age', ''))
-
-    def _add_search_row(self, typ, name, idnum, email, age):
-        """Helper method to add a row to the search results table."""
-        row = self.search_table.rowCount()
-        self.search_table.insertRow(row)
-        self.search_table.setItem(row, 0, QTableWidgetItem(typ))
-        self.search_table.setItem(row, 1, QTableWidgetItem(name))
-        self.search_table.setItem(row, 2, QTableWidgetItem(idnum))
-        self.search_table.setItem(row, 3, QTableWidgetItem(email))
-        self.search_table.setItem(row, 4, QTableWidgetItem(str(age)))
+
+        # One fuzzy search across all three tables (single query in the repo)
+        self.search_model.set_rows([
+            (r['type'], r['name'], r['id_number'], r.get('email', ''), r.get('age', ''))
+            for r in self.db.search_all(query)
+        ])
 
     def save_data(self):
         """Export all data to a JSON file."""
@@ -733,26 +849,49 @@ class SchoolManagementSystem(QMainWindow):
         path, _ = QFileDialog.getSaveFileName(self, "Export CSV", "", "CSV Files (*.csv)")
         if not path:
             return
-        try:
-            with open(path, "w", newline='') as f:
+
+        def job(db):
+            # rows go straight from the SQLite cursors to the file (no full lists in memory)
+            with open(path, "w", newline='', buffering=1 << 20) as f:
                 w = csv.writer(f)
                 w.writerow(["Type", "Name", "ID Number", "Email", "Age"])
-                
-                students = self.db.get_all_students()
-                for s in students:
-                    w.writerow(["Student", s["name"], s["student_id"], s["email"], s["age"]])
-                
-                instructors = self.db.get_all_instructors()
-                for i in instructors:
-                    w.writerow(["Instructor", i["name"], i["instructor_id"], i["email"], i["age"]])
-                
-                courses = self.db.get_all_courses()
-                for c in courses:
-                    w.writerow(["Course", c["course_name"], c["course_id"], "", ""])
-                    
-            QMessageBox.information(self, "Export", "Data exported to CSV.")
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Export failed: {e}")
+                w.writerows(["Student", s["name"], s["student_id"], s["email"], s["age"]]
+                            for s in db.iter_students())
+                w.writerows(["Instructor", i["name"], i["instructor_id"], i["email"], i["age"]]
+                            for i in db.iter_instructors())
+                w.writerows(["Course", c["course_name"], c["course_id"], "", ""]
+                            for c in db.iter_courses())
+            return "Data exported to CSV."
+
+        self.run_in_background("Export", job)
+
+    def run_in_background(self, title, job):
+        """Run a database job on the worker pool and report the result in a message box.
+        :param title: Short name of the job (e.g. "Export"), used in the messages
+        :type title: str
+        :param job: Callable taking a :class:`SQLiteRepository` and returning a success message
+        :type job: callable"""
+        worker = DBWorker(self.db.db_path, title, job)
+        worker.signals.finished.connect(self.on_job_finished)
+        worker.signals.failed.connect(self.on_job_failed)
+        self.pool.start(worker)
+
+    @pyqtSlot(str, str)
+    def on_job_finished(self, title, message):
+        """Show the success message of a background job (runs on the GUI thread)."""
+        QMessageBox.information(self, title, message)
+
+    @pyqtSlot(str, str)
+    def on_job_failed(self, title, error):
+        """Show the error of a background job (runs on the GUI thread)."""
+        QMessageBox.critical(self, "Error", f"{title} failed: {error}")
+
+    def closeEvent(self, event):
+        """Let a running export/backup finish before the window closes.
+        :param event: The close event
+        :type event: QCloseEvent"""
+        self.pool.waitForDone()
+        super().closeEvent(event)
 
     def validate_email(self, email):
         """Validate email format using a simple regex.
@@ -760,8 +899,7 @@ class SchoolManagementSystem(QMainWindow):
         :type email: str
         :returns: True if email is valid, False otherwise
         :rtype: bool"""
-        import re
-        return re.match(r"[^@]+@[^@]+\.[^@]+", email) is not None
+        return EMAIL_PATTERN.match(email) is not None
     
     def backup_database(self):
         """Create a backup of the current database."""
@@ -770,8 +908,9 @@ class SchoolManagementSystem(QMainWindow):
                 self, "Backup Database", "", "Database Files (*.sqlite *.db)"
             )
             if filename:
-                backup_path = self.db.backup(filename)
-                QMessageBox.information(self, "Backup", f"Database backed up to {backup_path}")
+                self.run_in_background(
+                    "Backup", lambda db: f"Database backed up to {db.backup(filename)}"
+                )
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Backup failed: {e}")
     
@@ -788,12 +927,9 @@ class SchoolManagementSystem(QMainWindow):
                     QMessageBox.Yes | QMessageBox.No
                 )
                 if reply == QMessageBox.Yes:
-                    from pathlib import Path
-                    import shutil
-                    self.db.close()
-                    dest = Path(self.db.db_path).resolve()
-                    shutil.copy2(filename, dest)
-                    self.db = SQLiteRepository(dest)
+                    # copies pages through SQLite (safe with WAL) and upgrades an older
+                    # backup to the current schema; the connection stays open
+                    self.db.restore(filename)
                     self.refresh_table()
                     self.update_course_and_registration()
                     QMessageBox.information(self, "Restore", "Database restored successfully.")
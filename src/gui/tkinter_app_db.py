@@ -1155,8 +1155,8 @@ class App(tk.Tk):
 
         :return: nothing; writes into the db and refreshes the ui
         :rtype: None
-        :raises: none here; i catch insert errors and move on (very lab-friendly)
-        :notes: instructor can be missing on a course; registrations are re-linked by calling repo.register_student.
+        :raises: none here; a failed import is rolled back and shown as an error dialog
+        :notes: instructor can be missing on a course; everything goes through repo.bulk_save (one commit).
         """
         # import a json snapshot and upsert into db (safe if duplicates)
         path = filedialog.askopenfilename(filetypes=[("JSON", "*.json"), ("All Files", "*.*")])
@@ -1164,29 +1164,10 @@ class App(tk.Tk):
             return
 
         s, i, c = load_from_json(path)
-
-        for st in s.values():
-            try:
-                self.repo.add_student(st.student_id, st.name, st.age, st.email)
-            except:
-                pass
-        for ins in i.values():
-            try:
-                self.repo.add_instructor(ins.instructor_id, ins.name, ins.age, ins.email)
-            except:
-                pass
-
-        for co in c.values():
-            iid = co.instructor.instructor_id if getattr(co, "instructor", None) else None
-            try:
-                self.repo.add_course(co.course_id, co.course_name, iid)
-            except:
-                self.repo.update_course(co.course_id, co.course_name, iid)
-            for s_obj in co.enrolled_students:
-                try:
-                    self.repo.register_student(s_obj.student_id, co.course_id)
-                except:
-                    pass
+        try:
+            self.repo.bulk_save(s.values(), i.values(), c.values())
+        except Exception as e:
+            return self._error(f"Import failed:\n{e}")
 
         self._refresh_all_views()
         self._info("Imported successfully.")
@@ -1223,13 +1204,13 @@ class App(tk.Tk):
         where = ""
         params: List[str] = []
         if q:
-            like = f"%{q.lower()}%"
+            like = f"%{q}%"  # sqlite LIKE already ignores ascii case
             where = """
             WHERE
-              lower(s.student_id) LIKE ? OR
-              lower(s.name)      LIKE ? OR
-              lower(s.email)     LIKE ? OR
-              lower(r.c_id)      LIKE ?
+              s.student_id LIKE ? OR
+              s.name       LIKE ? OR
+              s.email      LIKE ? OR
+              r.c_id       LIKE ?
             """
             params = [like, like, like, like]
         sql = f"""
@@ -1246,8 +1227,7 @@ class App(tk.Tk):
         ORDER BY s.student_id
         """
         cur = self.repo.conn.execute(sql, params)
-        cols = [c[0] for c in cur.description]
-        out = [dict(zip(cols, row)) for row in cur.fetchall()]
+        out = [dict(row) for row in cur]  # repo conn yields sqlite3.Row
         for r in out:
             r["courses"] = r["courses"].replace(",", ", ")
         return out
@@ -1255,7 +1235,7 @@ class App(tk.Tk):
     def _q_instructors(self, q: str, limit_scope: bool) -> List[Dict]:
         """
         fetches instructors with a simple join to list the courses they own. if `q` is given,
-        i filter by id/name/email or course id using like (lowercased).
+        i filter by id/name/email or course id using like (case-insensitive).
 
         :param q: search text to narrow results; empty means show all
         :type q: str
@@ -1270,13 +1250,13 @@ class App(tk.Tk):
         where = ""
         params: List[str] = []
         if q:
-            like = f"%{q.lower()}%"
+            like = f"%{q}%"  # sqlite LIKE already ignores ascii case
             where = """
             WHERE
-              lower(i.instructor_id) LIKE ? OR
-              lower(i.name)          LIKE ? OR
-              lower(i.email)         LIKE ? OR
-              lower(c.course_id)     LIKE ?
+              i.instructor_id LIKE ? OR
+              i.name          LIKE ? OR
+              i.email         LIKE ? OR
+              c.course_id     LIKE ?
             """
             params = [like, like, like, like]
         sql = f"""
@@ -1293,8 +1273,7 @@ class App(tk.Tk):
         ORDER BY i.instructor_id
         """
         cur = self.repo.conn.execute(sql, params)
-        cols = [c[0] for c in cur.description]
-        out = [dict(zip(cols, row)) for row in cur.fetchall()]
+        out = [dict(row) for row in cur]  # repo conn yields sqlite3.Row
         for r in out:
             r["courses"] = r["courses"].replace(",", ", ")
         return out
@@ -1302,7 +1281,7 @@ class App(tk.Tk):
     def _q_courses(self, q: str, limit_scope: bool) -> List[Dict]:
         """
         gets courses with their optional instructor and enrolled students. if i pass `q`,
-        i filter by course id/name, instructor id, or student id using lower+like.
+        i filter by course id/name, instructor id, or student id using like.
 
         :param q: search text to narrow results; empty means no filter
         :type q: str
@@ -1317,13 +1296,13 @@ class App(tk.Tk):
         where = ""
         params: List[str] = []
         if q:
-            like = f"%{q.lower()}%"
+            like = f"%{q}%"  # sqlite LIKE already ignores ascii case
             where = """
             WHERE
-              lower(c.course_id)     LIKE ? OR
-              lower(c.course_name)   LIKE ? OR
-              lower(i.instructor_id) LIKE ? OR
-              lower(r.s_id)          LIKE ?
+              c.course_id     LIKE ? OR
+              c.course_name   LIKE ? OR
+              i.instructor_id LIKE ? OR
+              r.s_id          LIKE ?
             """
             params = [like, like, like, like]
         sql = f"""
@@ -1340,8 +1319,7 @@ class App(tk.Tk):
         ORDER BY c.course_id
         """
         cur = self.repo.conn.execute(sql, params)
-        cols = [c[0] for c in cur.description]
-        out = [dict(zip(cols, row)) for row in cur.fetchall()]
+        out = [dict(row) for row in cur]  # repo conn yields sqlite3.Row
         for r in out:
             r["students"] = r["students"].replace(",", ", ")
         return out
@@ -15,6 +15,7 @@ Notes
 """
 
 from __future__ import annotations
+from operator import attrgetter
 from typing import Optional
 from src.validation.validators import (
     is_valid_course_id, is_valid_course_name, norm_id, norm_name
@@ -22,6 +23,9 @@ from src.validation.validators import (
 from .student import Student
 from .instructor import Instructor
 
+# used by to_dict
+_student_id = attrgetter("student_id")
+
 
 class Course:
     """
@@ -224,17 +228,19 @@ class Course:
             "course_id": self.course_id,
             "course_name": self.course_name,
             "instructor_id": self.instructor.instructor_id if self.instructor else None,
-            "enrolled_student_ids": [s.student_id for s in self.enrolled_students],
+            "enrolled_student_ids": list(map(_student_id, self.enrolled_students)),
         }
 
     @classmethod
-    def from_dict(cls, d: dict) -> "Course":
+    def from_dict(cls, d: dict, trusted: bool = False) -> "Course":
         """Construct a course from a dictionary (instructor is not attached here).
 
         Parameters
         ----------
         d : dict
             Dictionary with at least ``course_id`` and ``course_name``.
+        trusted : bool, optional
+            If ``True``, skip validation/normalization (data produced by ``to_dict``).
 
         Returns
         -------
@@ -245,4 +251,10 @@ class Course:
         -----
         - The instructor is intentionally set to ``None``; attach it later if needed.
         """
-        return cls(d["course_id"], d["course_name"], instructor=None)
+        if not trusted:
+            return cls(d["course_id"], d["course_name"], instructor=None)
+        c = cls.__new__(cls)
+        c.course_id, c.course_name = d["course_id"], d["course_name"]
+        c.instructor = None
+        c.enrolled_students = []
+        return c
@@ -14,12 +14,16 @@ Notes
 """
 
 from __future__ import annotations
+from operator import attrgetter
 from typing import TYPE_CHECKING
 from .person import Person
 from src.validation.validators import is_valid_instructor_id, norm_id
 if TYPE_CHECKING:
     from .course import Course
 
+# used by to_dict
+_course_id = attrgetter("course_id")
+
 
 class Instructor(Person):
     """
@@ -161,23 +165,26 @@ class Instructor(Person):
         Notes
         -----
         - Related objects are represented by their IDs only.
+        - Person fields (``name``, ``age``, ``email``) are written out here directly.
         """
-        # leverage Person's dict, then extend with instructor-specific bits
-        d = self._person_dict()
-        d.update({
+        return {
+            "name": self.name,
+            "age": self.age,
+            "email": self._email,
             "instructor_id": self.instructor_id,
-            "assigned_course_ids": [c.course_id for c in self.assigned_courses],
-        })
-        return d
+            "assigned_course_ids": list(map(_course_id, self.assigned_courses)),
+        }
 
     @classmethod
-    def from_dict(cls, d: dict) -> "Instructor":
+    def from_dict(cls, d: dict, trusted: bool = False) -> "Instructor":
         """Construct an Instructor from a dictionary.
 
         Parameters
         ----------
         d : dict
             Dictionary containing at least ``name``, ``age``, ``email``, and ``instructor_id``.
+        trusted : bool, optional
+            If ``True``, skip validation/normalization (data produced by ``to_dict``).
 
         Returns
         -------
@@ -188,4 +195,9 @@ class Instructor(Person):
         -----
         - Courses are intentionally not wired here; attach them later as needed.
         """
-        return cls(d["name"], d["age"], d["email"], d["instructor_id"])
+        if not trusted:
+            return cls(d["name"], d["age"], d["email"], d["instructor_id"])
+        i = cls.__new__(cls)
+        i.name, i.age, i._email, i.instructor_id = d["name"], d["age"], d["email"], d["instructor_id"]
+        i.assigned_courses = []
+        return i
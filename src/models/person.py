@@ -128,18 +128,3 @@ class Person:
         msg = f"Hi, I'm {self.name}. I am {self.age} years old. Please find attached my email address if you wish to contact me: {self._email}"
         print(msg)
         return msg
-
-    def _person_dict(self) -> dict:
-        """Serialize common person fields to a dict.
-
-        Returns
-        -------
-        dict
-            Dictionary with keys ``name``, ``age``, and ``email``.
-
-        Notes
-        -----
-        - Private helper because higher-level models usually extend this.
-        """
-        # keep it minimal; higher-level classes extend this with their own fields
-        return {"name": self.name, "age": self.age, "email": self.email}
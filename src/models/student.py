@@ -14,12 +14,16 @@ Notes
 """
 
 from __future__ import annotations
+from operator import attrgetter
 from typing import TYPE_CHECKING
 from .person import Person
 from src.validation.validators import is_valid_student_id, norm_id
 if TYPE_CHECKING:
     from .course import Course
 
+# used by to_dict
+_course_id = attrgetter("course_id")
+
 
 class Student(Person):
     """
@@ -173,21 +177,27 @@ class Student(Person):
         Notes
         -----
         - Related objects are represented by their IDs only.
+        - Person fields (``name``, ``age``, ``email``) are written out here directly.
         """
-        # reuse base dict then add student-specific fields
-        d = self._person_dict()
-        d.update({"student_id": self.student_id})
-        d["registered_course_ids"] = [c.course_id for c in self.registered_courses]
-        return d
+        return {
+            "name": self.name,
+            "age": self.age,
+            "email": self._email,
+            "student_id": self.student_id,
+            "registered_course_ids": list(map(_course_id, self.registered_courses)),
+        }
 
     @classmethod
-    def from_dict(cls, d: dict) -> "Student":
+    def from_dict(cls, d: dict, trusted: bool = False) -> "Student":
         """Construct a Student from a dictionary.
 
         Parameters
         ----------
         d : dict
             Dictionary containing at least ``name``, ``age``, ``email``, and ``student_id``.
+        trusted : bool, optional
+            If ``True``, skip validation/normalization and set the fields as-is.
+            Only use this for data we wrote ourselves via ``to_dict``.
 
         Returns
         -------
@@ -197,5 +207,11 @@ class Student(Person):
         Notes
         -----
         - Courses are intentionally not wired here; attach them later if needed.
+        - The trusted path bypasses ``__init__`` (no validator calls per record).
         """
-        return cls(d["name"], d["age"], d["email"], d["student_id"])
+        if not trusted:
+            return cls(d["name"], d["age"], d["email"], d["student_id"])
+        s = cls.__new__(cls)
+        s.name, s.age, s._email, s.student_id = d["name"], d["age"], d["email"], d["student_id"]
+        s.registered_courses = []
+        return s
@@ -3,30 +3,60 @@
 :synopsis: JSON persistence for Students, Instructors, and Courses.
 
 This module provides two helpers to save/load the in-memory model objects
-(``Student``, ``Instructor``, ``Course``) to/from a JSON file. It also exposes a
-tiny in-memory ``Repository`` wrapper that groups the three dictionaries and
-offers simple add/save/load utilities.
+(``Student``, ``Instructor``, ``Course``) to/from a JSON file, plus a binary
+snapshot pair (``save_snapshot`` / ``load_snapshot``) for internal session
+saves. It also exposes a tiny in-memory ``Repository`` wrapper that groups the
+three dictionaries and offers simple add/save/load utilities.
 
 Notes
 -----
 - Schema is versioned via ``_SCHEMA_VERSION`` for future changes (basic).
 - Relationships are re-hydrated after object construction to avoid recursion.
 - Intentionally lightweight for the lab (no fancy error handling here).
+- ``orjson`` is used for encoding/decoding when installed (much faster); we fall
+  back to the stdlib ``json`` module otherwise, so it stays optional.
+- Snapshots are pickles of the same payload JSON uses (not of the object graph,
+  which is cyclic and deep). JSON stays the user-facing export format.
 """
 
 from __future__ import annotations
 from pathlib import Path
 import json
+import pickle
 from typing import Iterable, Tuple, Dict, Any
 from ..models import Student, Instructor, Course
 
+try:  # optional speedup; the stdlib path below works fine without it
+    import orjson
+except ImportError:
+    orjson = None
+
 _SCHEMA_VERSION = 1
 
+# stdlib fallback: build the encoders once instead of per json.dumps() call.
+# to_dict() only returns plain dicts/lists/str/int, so no cycle check needed.
+_PRETTY_ENCODER = json.JSONEncoder(indent=2, ensure_ascii=False, check_circular=False)
+_COMPACT_ENCODER = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False, check_circular=False)
+
+
+def _to_payload(students: Iterable[Student],
+                instructors: Iterable[Instructor],
+                courses: Iterable[Course]) -> Dict[str, Any]:
+    """Build the plain-data payload shared by the JSON and snapshot writers."""
+    # IDs for relations are already in to_dict()
+    return {
+        "schema_version": _SCHEMA_VERSION,
+        "students": [s.to_dict() for s in students],
+        "instructors": [i.to_dict() for i in instructors],
+        "courses": [c.to_dict() for c in courses],
+    }
+
 
 def save_to_json(path: str | Path,
                  students: Iterable[Student],
                  instructors: Iterable[Instructor],
-                 courses: Iterable[Course]) -> None:
+                 courses: Iterable[Course],
+                 pretty: bool = True) -> None:
     """Serialize models to a JSON file (atomic via temp file + replace).
 
     Parameters
@@ -39,6 +69,9 @@ def save_to_json(path: str | Path,
         Instructors to serialize.
     courses : Iterable[Course]
         Courses to serialize.
+    pretty : bool, optional
+        Indent the output for humans (default). Pass ``False`` for a compact
+        payload when the file is only ever read back by ``load_from_json``.
 
     Returns
     -------
@@ -48,28 +81,31 @@ def save_to_json(path: str | Path,
     -----
     - Writes to ``<path>.tmp`` first then replaces the target (safer on crash).
     - Uses UTF-8 and ``ensure_ascii=False`` so names/emails look normal.
+    - With ``orjson`` available the payload is encoded straight to bytes.
     """
-    # build the payload dict (IDs for relations are already in to_dict())
-    data = {
-        "schema_version": _SCHEMA_VERSION,
-        "students": [s.to_dict() for s in students],
-        "instructors": [i.to_dict() for i in instructors],
-        "courses": [c.to_dict() for c in courses],
-    }
+    data = _to_payload(students, instructors, courses)
     p = Path(path)
     p.parent.mkdir(parents=True, exist_ok=True)  # make sure folder exists
     tmp = p.with_suffix(p.suffix + ".tmp")       # temp path for atomic write
-    tmp.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
+    if orjson is not None:
+        tmp.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2 if pretty else 0))
+    else:
+        encoder = _PRETTY_ENCODER if pretty else _COMPACT_ENCODER
+        tmp.write_text(encoder.encode(data), encoding="utf-8")
     tmp.replace(p)  # atomic-ish on most OSes (good enough for lab)
 
 
-def load_from_json(path: str | Path) -> Tuple[Dict[str, Student], Dict[str, Instructor], Dict[str, Course]]:
+def load_from_json(path: str | Path,
+                   trusted: bool = False) -> Tuple[Dict[str, Student], Dict[str, Instructor], Dict[str, Course]]:
     """Load models from a JSON file and re-wire their relationships.
 
     Parameters
     ----------
     path : str or Path
         Source JSON file path.
+    trusted : bool, optional
+        Skip per-record validation (see ``from_dict``). Only for files written
+        by ``save_to_json``; anything user-supplied should keep the default.
 
     Returns
     -------
@@ -84,23 +120,31 @@ def load_from_json(path: str | Path) -> Tuple[Dict[str, Student], Dict[str, Inst
       carefully to avoid missing links.
     """
     p = Path(path)
-    data: Dict[str, Any] = json.loads(p.read_text(encoding="utf-8"))
+    if orjson is not None:
+        data: Dict[str, Any] = orjson.loads(p.read_bytes())
+    else:
+        data = json.loads(p.read_text(encoding="utf-8"))
+    return _from_payload(data, trusted)
 
+
+def _from_payload(data: Dict[str, Any],
+                  trusted: bool) -> Tuple[Dict[str, Student], Dict[str, Instructor], Dict[str, Course]]:
+    """Rebuild model objects from a payload dict and re-wire their relations."""
     students_by_id: Dict[str, Student] = {}
     instructors_by_id: Dict[str, Instructor] = {}
     courses_by_id: Dict[str, Course] = {}
 
     # 1) build plain objects (no links yet)
     for sd in data.get("students", []):
-        s = Student.from_dict(sd)
+        s = Student.from_dict(sd, trusted)
         students_by_id[s.student_id] = s
 
     for idd in data.get("instructors", []):
-        i = Instructor.from_dict(idd)
+        i = Instructor.from_dict(idd, trusted)
         instructors_by_id[i.instructor_id] = i
 
     for cd in data.get("courses", []):
-        c = Course.from_dict(cd)
+        c = Course.from_dict(cd, trusted)
         courses_by_id[c.course_id] = c
 
     # 2) re-hydrate student <-> course links
@@ -135,6 +179,63 @@ def load_from_json(path: str | Path) -> Tuple[Dict[str, Student], Dict[str, Inst
     return students_by_id, instructors_by_id, courses_by_id
 
 
+def save_snapshot(path: str | Path,
+                  students: Iterable[Student],
+                  instructors: Iterable[Instructor],
+                  courses: Iterable[Course]) -> None:
+    """Write a binary (pickle) snapshot of the models (atomic via temp file).
+
+    Parameters
+    ----------
+    path : str or Path
+        Destination snapshot file path.
+    students : Iterable[Student]
+        Students to store.
+    instructors : Iterable[Instructor]
+        Instructors to store.
+    courses : Iterable[Course]
+        Courses to store.
+
+    Returns
+    -------
+    None
+
+    Notes
+    -----
+    - Meant for internal "save session / reload session"; no text escaping
+      or UTF-8 round trip, so it is smaller and faster than JSON.
+    - Uses the highest pickle protocol (5 on Python 3.8+).
+    """
+    data = _to_payload(students, instructors, courses)
+    p = Path(path)
+    p.parent.mkdir(parents=True, exist_ok=True)
+    tmp = p.with_suffix(p.suffix + ".tmp")
+    tmp.write_bytes(pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL))
+    tmp.replace(p)
+
+
+def load_snapshot(path: str | Path) -> Tuple[Dict[str, Student], Dict[str, Instructor], Dict[str, Course]]:
+    """Load a snapshot written by :func:`save_snapshot` and re-wire relations.
+
+    Parameters
+    ----------
+    path : str or Path
+        Source snapshot file path.
+
+    Returns
+    -------
+    tuple(dict[str, Student], dict[str, Instructor], dict[str, Course])
+        Three dictionaries keyed by their IDs.
+
+    Notes
+    -----
+    - Unpickling runs code from the file, so only load snapshots we wrote.
+      For the same reason records take the trusted ``from_dict`` path.
+    """
+    data: Dict[str, Any] = pickle.loads(Path(path).read_bytes())
+    return _from_payload(data, trusted=True)
+
+
 class Repository:
     """
     Minimal in-memory repository for the three entity types.
@@ -212,20 +313,23 @@ class Repository:
         """
         self.courses[c.course_id] = c
 
-    def save(self, path: str | Path) -> None:
+    def save(self, path: str | Path, pretty: bool = True) -> None:
         """Persist the current repository state to a JSON file.
 
         Parameters
         ----------
         path : str or Path
             Destination JSON file path.
+        pretty : bool, optional
+            Indented output (default) or compact when ``False``.
 
         Returns
         -------
         None
         """
         # delegate to the module-level function (keeps logic in one place)
-        save_to_json(path, self.students.values(), self.instructors.values(), self.courses.values())
+        save_to_json(path, self.students.values(), self.instructors.values(), self.courses.values(),
+                     pretty=pretty)
 
     @classmethod
     def load(cls, path: str | Path) -> "Repository":
@@ -249,3 +353,35 @@ class Repository:
         s, i, c = load_from_json(path)
         repo.students, repo.instructors, repo.courses = s, i, c
         return repo
+
+    def save_snapshot(self, path: str | Path) -> None:
+        """Persist the current state as a binary snapshot (see ``save_snapshot``).
+
+        Parameters
+        ----------
+        path : str or Path
+            Destination snapshot file path.
+
+        Returns
+        -------
+        None
+        """
+        save_snapshot(path, self.students.values(), self.instructors.values(), self.courses.values())
+
+    @classmethod
+    def load_snapshot(cls, path: str | Path) -> "Repository":
+        """Load a repository from a binary snapshot.
+
+        Parameters
+        ----------
+        path : str or Path
+            Source snapshot file path.
+
+        Returns
+        -------
+        Repository
+            New repository instance populated with loaded data.
+        """
+        repo = cls()
+        repo.students, repo.instructors, repo.courses = load_snapshot(path)
+        return repo
@@ -68,7 +68,14 @@ def is_non_negative_int(v: Any) -> bool:
     -------
     bool
         ``True`` for non-negative integers (after casting), else ``False``.
+
+    Notes
+    -----
+    - Plain ints (the usual case, e.g. every ``Person`` built from the DB) are
+      checked directly; only other types pay for the ``int()`` + try/except.
     """
+    if isinstance(v, int):
+        return v >= 0
     try:
         return int(v) >= 0
     except (TypeError, ValueError):
@@ -14,17 +14,21 @@ Notes
 
 import os
 from pathlib import Path
+import pytest
 from src.models import Student, Instructor, Course
-from src.persistence.json_store import save_to_json, load_from_json
+from src.persistence.json_store import save_to_json, load_from_json, Repository
 
 
-def test_json_roundtrip(tmp_path: Path):
+@pytest.mark.parametrize("trusted", [False, True])
+def test_json_roundtrip(tmp_path: Path, trusted: bool):
     """Create objects, persist to JSON, reload, and verify relations.
 
     Parameters
     ----------
     tmp_path : Path
         Temporary directory provided by pytest for file I/O.
+    trusted : bool
+        Whether to load through the validating or the trusted ``from_dict`` path.
 
     Returns
     -------
@@ -54,7 +58,7 @@ def test_json_roundtrip(tmp_path: Path):
     save_to_json(out, [s1, s2], [i1], [c1, c2])
 
     # load it back (this should rebuild the dictionaries + links)
-    students, instructors, courses = load_from_json(out)
+    students, instructors, courses = load_from_json(out, trusted=trusted)
 
     # check that all entities made it back with the right IDs
     assert set(students.keys()) == {"S001", "S002"}
@@ -72,3 +76,38 @@ def test_json_roundtrip(tmp_path: Path):
     assert s1_loaded in c1_loaded.enrolled_students
     assert c1_loaded.instructor is i1_loaded
     assert c2_loaded in i1_loaded.assigned_courses
+
+
+def test_snapshot_roundtrip(tmp_path: Path):
+    """Save a repository as a binary snapshot and load it back.
+
+    Parameters
+    ----------
+    tmp_path : Path
+        Temporary directory provided by pytest for file I/O.
+
+    Returns
+    -------
+    None
+
+    Notes
+    -----
+    - Same relation checks as the JSON test, just through the pickle format.
+    """
+    repo = Repository()
+    s1 = Student("Tamara", 22, "tamara@example.com", "S001")
+    i1 = Instructor("Dr. Smith", 45, "smith@example.com", "I100")
+    c1 = Course("EECE435", "Tools Lab", i1)
+    c1.add_student(s1)
+    repo.add_student(s1)
+    repo.add_instructor(i1)
+    repo.add_course(c1)
+
+    out = tmp_path / "session.snapshot"
+    repo.save_snapshot(out)
+    loaded = Repository.load_snapshot(out)
+
+    c1_loaded = loaded.courses["EECE435"]
+    assert c1_loaded.instructor is loaded.instructors["I100"]
+    assert loaded.students["S001"] in c1_loaded.enrolled_students
+    assert c1_loaded in loaded.students["S001"].registered_courses
@@ -0,0 +1,459 @@
+"""
+:module: tests.test_sqlite_repo
+:synopsis: Unit tests for the SQLite repository (bulk paths).
+
+Each test gets a fresh database file under pytest's ``tmp_path`` so the
+shipped ``db/school.db`` is never touched.
+
+Notes
+-----
+- The schema comes from ``db.init_db.init_db`` (same as the real app).
+- Only the repository API is exercised here; no GUI involved.
+"""
+
+from pathlib import Path
+import json
+import sqlite3
+import pytest
+from db.init_db import init_db
+from db.sqlite_repo import SQLiteRepository
+from src.models import Student, Instructor, Course
+
+
+@pytest.fixture
+def repo(tmp_path: Path):
+    """Yield a repository bound to a fresh, initialized temp database."""
+    db_path = tmp_path / "test.db"
+    init_db(db_path)
+    with SQLiteRepository(db_path) as r:
+        yield r
+
+
+def test_bulk_save_inserts_everything(repo: SQLiteRepository):
+    """``bulk_save`` writes people, courses and registrations in one go.
+
+    Returns
+    -------
+    None
+
+    Notes
+    -----
+    - Saving the same objects twice must not fail (duplicates are skipped).
+    """
+    s = Student("Tamara", 22, "tamara@example.com", "S001")
+    i = Instructor("Dr. Smith", 45, "smith@example.com", "I100")
+    c = Course("EECE435", "Tools Lab", i)
+    c.add_student(s)
+
+    repo.bulk_save([s], [i], [c])
+    repo.bulk_save([s], [i], [c])
+
+    assert [r["student_id"] for r in repo.get_all_students()] == ["S001"]
+    assert repo.get_course("EECE435")["i_id"] == "I100"
+    assert repo.get_registrations(s_id="S001") == [{"s_id": "S001", "c_id": "EECE435"}]
+
+
+def test_export_import_roundtrip(repo: SQLiteRepository, tmp_path: Path):
+    """Export to JSON, wipe via import of the same file, and compare contents.
+
+    Returns
+    -------
+    None
+
+    Notes
+    -----
+    - ``import_from_json`` replaces everything, so the DB should look identical.
+    """
+    repo.add_student("S001", "Alice", 20, "alice@example.com")
+    repo.add_student("S002", "Bob", 21, "bob@example.com")
+    repo.add_instructor("I001", "Dr. Smith", 45, "smith@example.com")
+    repo.add_course("EECE435", "Tools Lab", "I001")
+    repo.add_course("EECE455", "Design")
+    repo.register_student("S001", "EECE435")
+    repo.register_student("S002", "EECE435")
+
+    before = (repo.get_all_students(), repo.get_all_instructors(),
+              repo.get_all_courses(), repo.get_registrations())
+    out = repo.export_to_json(str(tmp_path / "export.json"))
+    repo.delete_student("S002")
+
+    assert repo.import_from_json(out) is True
+    after = (repo.get_all_students(), repo.get_all_instructors(),
+             repo.get_all_courses(), repo.get_registrations())
+    assert after == before
+
+
+def test_search_all_spans_tables(repo: SQLiteRepository):
+    """``search_all`` matches names/IDs across the three tables in one call.
+
+    Returns
+    -------
+    None
+    """
+    repo.add_student("S001", "Sam Adams", 20, "sam@example.com")
+    repo.add_instructor("I001", "Dr. Sam", 45, "drsam@example.com")
+    repo.add_course("EECE435", "Samples and Signals", "I001")
+    repo.add_course("EECE455", "Design")
+
+    hits = repo.search_all("sam")
+    assert [(h["type"], h["id_number"]) for h in hits] == [
+        ("Student", "S001"), ("Instructor", "I001"), ("Course", "EECE435"),
+    ]
+    assert hits[2]["email"] == "" and hits[2]["age"] == ""
+    assert repo.search_all("zzz") == []
+    only = repo.search_all("sam", kinds=("Course", "Student"))
+    assert [h["type"] for h in only] == ["Student", "Course"]
+    with pytest.raises(ValueError):
+        repo.search_all("sam", kinds=("Teacher",))
+
+
+def test_iter_students_matches_get_all(repo: SQLiteRepository):
+    """``iter_students`` yields the same dicts as ``get_all_students``, lazily.
+
+    Returns
+    -------
+    None
+    """
+    repo.add_student("S002", "Bob", 21, "bob@example.com")
+    repo.add_student("S001", "Alice", 20, "alice@example.com")
+
+    it = repo.iter_students()
+    assert next(it)["name"] == "Alice"  # sorted by name, not ID
+    assert list(repo.iter_students()) == repo.get_all_students()
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_backup_then_restore(repo: SQLiteRepository, tmp_path: Path, compact: bool):
+    """``restore`` brings back what ``backup`` saved, on the same connection.
+
+    Returns
+    -------
+    None
+    """
+    repo.add_student("S001", "Alice", 20, "alice@example.com")
+    repo.backup(tmp_path / "snap.sqlite", compact=compact)  # existing file gets replaced
+    saved = repo.backup(tmp_path / "snap.sqlite", compact=compact)
+    assert not (tmp_path / "snap.sqlite.part").exists()  # staged copy was renamed into place
+    repo.delete_student("S001")
+    repo.add_student("S002", "Bob", 21, "bob@example.com")
+
+    repo.restore(saved)
+    assert [s["student_id"] for s in repo.get_all_students()] == ["S001"]
+
+
+def test_restore_upgrades_old_backup_schema(repo: SQLiteRepository, tmp_path: Path):
+    """Restoring a rowid-era backup brings the current tables and indexes back.
+
+    Returns
+    -------
+    None
+    """
+    old = tmp_path / "old_backup.sqlite"
+    conn = sqlite3.connect(old)
+    conn.executescript("""
+        CREATE TABLE STUDENTS (student_id TEXT PRIMARY KEY, name TEXT NOT NULL,
+                               age INTEGER NOT NULL, email TEXT NOT NULL);
+        CREATE TABLE INSTRUCTORS (instructor_id TEXT PRIMARY KEY, name TEXT NOT NULL,
+                                  age INTEGER NOT NULL, email TEXT NOT NULL);
+        CREATE TABLE COURSES (course_id TEXT PRIMARY KEY, course_name TEXT NOT NULL, i_id TEXT,
+                              FOREIGN KEY (i_id) REFERENCES INSTRUCTORS(instructor_id));
+        CREATE TABLE REGISTRATION (s_id TEXT NOT NULL, c_id TEXT NOT NULL, PRIMARY KEY (s_id, c_id),
+                                   FOREIGN KEY (s_id) REFERENCES STUDENTS(student_id),
+                                   FOREIGN KEY (c_id) REFERENCES COURSES(course_id));
+        INSERT INTO STUDENTS VALUES ('S001', 'Alice', 20, 'alice@example.com');
+        INSERT INTO COURSES VALUES ('C001', 'Math', NULL);
+        INSERT INTO REGISTRATION VALUES ('S001', 'C001');
+    """)
+    conn.close()
+
+    repo.restore(old)
+    tables = repo.conn.execute("SELECT sql FROM sqlite_master WHERE type = 'table'").fetchall()
+    assert len(tables) == 4 and all("WITHOUT ROWID" in row[0] for row in tables)
+    indexes = {row[0] for row in repo.conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert {"idx_registration_c_s", "idx_courses_i_id"} <= indexes
+    assert repo.get_registrations(c_id="C001") == [{"s_id": "S001", "c_id": "C001"}]
+
+
+def test_import_turns_foreign_keys_back_on(repo: SQLiteRepository, tmp_path: Path):
+    """After ``import_from_json`` the connection must still enforce FKs.
+
+    Returns
+    -------
+    None
+
+    Notes
+    -----
+    - ``PRAGMA foreign_keys`` is a no-op inside a transaction, so re-enabling
+      it before the commit used to leave FKs off for the rest of the session.
+    """
+    repo.add_student("S001", "Alice", 20, "alice@example.com")
+    assert repo.import_from_json(repo.export_to_json(str(tmp_path / "e.json")))
+
+    assert repo.conn.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+    with pytest.raises(sqlite3.IntegrityError):
+        repo.conn.execute("INSERT INTO REGISTRATION (s_id, c_id) VALUES ('S001', 'NOPE')")
+
+
+def test_import_rejects_dangling_references(repo: SQLiteRepository, tmp_path: Path):
+    """A file whose registrations point nowhere is refused and nothing changes.
+
+    Returns
+    -------
+    None
+    """
+    repo.add_student("S001", "Alice", 20, "alice@example.com")
+    bad = tmp_path / "bad.json"
+    bad.write_text(json.dumps({"students": [], "registrations": [{"s_id": "S404", "c_id": "C404"}]}))
+
+    assert repo.import_from_json(str(bad)) is False
+    assert [s["student_id"] for s in repo.get_all_students()] == ["S001"]
+
+
+
+@pytest.mark.parametrize("content", [b'{"students": [', b"not json at all", b"\xff\xfe"])
+def test_import_returns_false_on_malformed_file(repo: SQLiteRepository, tmp_path: Path, content: bytes):
+    """Unparseable files are reported with ``False`` (not an exception) and nothing changes.
+
+    Returns
+    -------
+    None
+    """
+    repo.add_student("S001", "Alice", 20, "alice@example.com")
+    bad = tmp_path / "broken.json"
+    bad.write_bytes(content)
+
+    assert repo.import_from_json(str(bad)) is False
+    assert [s["student_id"] for s in repo.get_all_students()] == ["S001"]
+
+def test_transaction_commits_once_or_rolls_back(repo: SQLiteRepository):
+    """``transaction()`` groups writes: all of them land, or none do.
+
+    Returns
+    -------
+    None
+    """
+    with repo.transaction():
+        repo.add_student("S001", "Alice", 20, "alice@example.com")
+        repo.add_student("S002", "Bob", 21, "bob@example.com")
+        assert repo.conn.in_transaction  # nothing committed mid-block
+    assert not repo.conn.in_transaction
+    assert len(repo.get_all_students()) == 2
+
+    with pytest.raises(sqlite3.IntegrityError):
+        with repo.transaction():
+            repo.add_student("S003", "Carol", 22, "carol@example.com")
+            repo.add_student("S001", "Dup", 20, "dup@example.com")  # PK clash
+    assert [s["student_id"] for s in repo.get_all_students()] == ["S001", "S002"]
+
+
+def test_bulk_add_and_register(repo: SQLiteRepository):
+    """The ``add_*_bulk`` / ``register_students_bulk`` helpers write whole batches.
+
+    Returns
+    -------
+    None
+    """
+    repo.add_instructors_bulk([("I001", "Dr. Smith", 45, "smith@example.com")])
+    repo.add_courses_bulk([("EECE435", "Tools Lab", "I001"), ("EECE455", "Design", None)])
+    repo.add_students_bulk([("S001", "Alice", 20, "a@example.com"),
+                            ("S002", "Bob", 21, "b@example.com")])
+    repo.register_students_bulk([("S001", "EECE435"), ("S002", "EECE435"), ("S001", "EECE435")])
+    assert len(repo.get_registrations(c_id="EECE435")) == 2
+    assert repo.get_course("EECE455")["i_id"] is None
+
+    with pytest.raises(sqlite3.IntegrityError):  # unknown course -> whole batch dropped
+        repo.register_students_bulk([("S001", "EECE999")])
+    assert len(repo.get_registrations()) == 2
+
+
+def test_register_student_errors_and_duplicates(repo: SQLiteRepository):
+    """``register_student`` rejects unknown IDs and ignores repeats.
+
+    Returns
+    -------
+    None
+    """
+    repo.add_student("S001", "Alice", 20, "alice@example.com")
+    repo.add_course("EECE435", "Tools Lab")
+
+    with pytest.raises(ValueError, match="Student"):
+        repo.register_student("S999", "EECE435")
+    with pytest.raises(ValueError, match="Course"):
+        repo.register_student("S001", "EECE999")
+
+    repo.register_student("S001", "EECE435")
+    repo.register_student("S001", "EECE435")  # already registered -> no error
+    assert repo.get_registrations() == [{"s_id": "S001", "c_id": "EECE435"}]
+
+
+def test_update_student_partial_fields(repo: SQLiteRepository):
+    """Only the fields passed to ``update_student`` change.
+
+    Returns
+    -------
+    None
+    """
+    repo.add_student("S001", "Alice", 20, "alice@example.com")
+    repo.update_student("S001", email="new@example.com")
+    repo.update_student("S001", name="Alicia", age=21)
+    repo.update_student("S001")  # nothing passed -> no-op
+    assert repo.get_student("S001") == {
+        "student_id": "S001", "name": "Alicia", "age": 21, "email": "new@example.com",
+    }
+
+
+def test_search_rejects_unknown_columns(repo: SQLiteRepository):
+    """``search`` only accepts real column names of the chosen table.
+
+    Returns
+    -------
+    None
+    """
+    repo.add_student("S001", "Alice", 20, "alice@example.com")
+    assert repo.search("STUDENTS", email="ALICE", name="ali")[0]["student_id"] == "S001"
+    with pytest.raises(ValueError):
+        repo.search("STUDENTS", **{"name LIKE '%' OR 1=1 --": "x"})
+
+
+def test_close_is_idempotent_and_context_manager_closes(tmp_path: Path):
+    """Leaving the ``with`` block closes the connection; extra ``close()`` is harmless.
+
+    Returns
+    -------
+    None
+    """
+    with SQLiteRepository(tmp_path / "ctx.db") as r:
+        r.add_student("S001", "Alice", 20, "alice@example.com")
+    with pytest.raises(sqlite3.ProgrammingError):
+        r.conn.execute("SELECT 1")
+    r.close()
+
+    r2 = SQLiteRepository(tmp_path / "ctx.db")
+    r2.conn.close()  # PRAGMA optimize fails on this; close() must still not raise
+    r2.close()
+
+
+def test_pragmas_can_be_overridden(tmp_path: Path):
+    """Defaults apply per connection; ``pragmas=`` overrides them.
+
+    Returns
+    -------
+    None
+    """
+    with SQLiteRepository(tmp_path / "p.db") as r:
+        assert r.conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+    with SQLiteRepository(tmp_path / "p.db", pragmas={"synchronous": "FULL"}) as r:
+        assert r.conn.execute("PRAGMA synchronous").fetchone()[0] == 2  # FULL
+    with pytest.raises(ValueError):
+        SQLiteRepository(tmp_path / "p.db", pragmas={"synchronous": "OFF; DROP TABLE STUDENTS"})
+
+
+def test_old_rowid_tables_are_migrated(tmp_path: Path):
+    """Files with the pre-WITHOUT ROWID schema are rebuilt with their rows intact.
+
+    Returns
+    -------
+    None
+    """
+    db_path = tmp_path / "old.db"
+    conn = sqlite3.connect(db_path)
+    conn.executescript("""
+        CREATE TABLE STUDENTS (student_id TEXT PRIMARY KEY, name TEXT NOT NULL,
+                               age INTEGER NOT NULL, email TEXT NOT NULL);
+        CREATE TABLE INSTRUCTORS (instructor_id TEXT PRIMARY KEY, name TEXT NOT NULL,
+                                  age INTEGER NOT NULL, email TEXT NOT NULL);
+        CREATE TABLE COURSES (course_id TEXT PRIMARY KEY, course_name TEXT NOT NULL, i_id TEXT,
+                              FOREIGN KEY (i_id) REFERENCES INSTRUCTORS(instructor_id));
+        CREATE TABLE REGISTRATION (s_id TEXT NOT NULL, c_id TEXT NOT NULL, PRIMARY KEY (s_id, c_id),
+                                   FOREIGN KEY (s_id) REFERENCES STUDENTS(student_id),
+                                   FOREIGN KEY (c_id) REFERENCES COURSES(course_id));
+        INSERT INTO STUDENTS VALUES ('S001', 'Alice', 20, 'alice@example.com');
+        INSERT INTO INSTRUCTORS VALUES ('I001', 'Bob', 40, 'bob@example.com');
+        INSERT INTO COURSES VALUES ('C001', 'Math', 'I001');
+        INSERT INTO REGISTRATION VALUES ('S001', 'C001');
+    """)
+    conn.close()
+
+    with SQLiteRepository(db_path) as r:
+        sqls = [row[0] for row in r.conn.execute("SELECT sql FROM sqlite_master WHERE type = 'table'")]
+        assert len(sqls) == 4 and all("WITHOUT ROWID" in s for s in sqls)
+        assert r.get_registrations() == [{"s_id": "S001", "c_id": "C001"}]
+        assert r.get_course("C001")["i_id"] == "I001"
+        assert r.conn.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+        # indexes were dropped with the old tables and recreated
+        assert r.conn.execute(
+            "SELECT count(*) FROM sqlite_master WHERE name = 'idx_registration_c_s'"
+        ).fetchone()[0] == 1
+
+
+def test_recreated_db_file_gets_schema_again(tmp_path: Path):
+    """Deleting the file between two repos in one process still yields a usable schema.
+
+    Returns
+    -------
+    None
+    """
+    db_path = tmp_path / "again.db"
+    with SQLiteRepository(db_path) as r:
+        r.add_student("S001", "Alice", 20, "alice@example.com")
+    for suffix in ("", "-wal", "-shm"):
+        Path(str(db_path) + suffix).unlink(missing_ok=True)
+
+    with SQLiteRepository(db_path) as r:
+        r.add_student("S002", "Bob", 21, "bob@example.com")
+        assert [s["student_id"] for s in r.get_all_students()] == ["S002"]
+
+
+def test_migration_keeps_rowid_tables_it_cannot_convert(tmp_path: Path):
+    """Legacy rows WITHOUT ROWID rejects leave the old table in place (with a warning).
+
+    Returns
+    -------
+    None
+    """
+    db_path = tmp_path / "legacy.db"
+    conn = sqlite3.connect(db_path)
+    # rowid tables accept a NULL TEXT primary key; WITHOUT ROWID tables don't
+    conn.execute("CREATE TABLE STUDENTS (student_id TEXT PRIMARY KEY, name TEXT NOT NULL,"
+                 " age INTEGER NOT NULL, email TEXT NOT NULL)")
+    conn.execute("INSERT INTO STUDENTS VALUES (NULL, 'Ghost', 30, 'g@example.com')")
+    conn.commit()
+    conn.close()
+
+    with pytest.warns(RuntimeWarning, match="STUDENTS"):
+        r = SQLiteRepository(db_path)
+    with r:
+        sql = r.conn.execute("SELECT sql FROM sqlite_master WHERE name = 'STUDENTS'").fetchone()[0]
+        assert "WITHOUT ROWID" not in sql.upper()
+        assert [s["name"] for s in r.get_all_students()] == ["Ghost"]
+        r.add_student("S001", "Alice", 20, "alice@example.com")  # still usable
+        assert r.conn.execute(
+            "SELECT count(*) FROM sqlite_master WHERE name = 'idx_registration_c_s'"
+        ).fetchone()[0] == 1
+
+
+def test_failed_setup_closes_connection(tmp_path: Path, monkeypatch):
+    """An error during schema setup closes the new connection instead of leaking it.
+
+    Returns
+    -------
+    None
+    """
+    opened = []
+    real_connect = sqlite3.connect
+
+    def tracking_connect(*args, **kwargs):
+        opened.append(real_connect(*args, **kwargs))
+        return opened[-1]
+
+    def locked(conn):
+        raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(sqlite3, "connect", tracking_connect)
+    monkeypatch.setattr("db.sqlite_repo.create_schema", locked)
+    with pytest.raises(sqlite3.OperationalError):
+        SQLiteRepository(tmp_path / "locked.db")
+    monkeypatch.undo()
+
+    with pytest.raises(sqlite3.ProgrammingError):  # closed, not leaked
+        opened[0].execute("SELECT 1")